@@ -8,6 +8,26 @@ from trace_analyzer import TraceAnalyzer
 from trace_analyzer.core.types import EndpointStats, KafkaStats
 
 
+def _worker_count(value: str) -> int:
+    """
+    Parse the --workers option, rejecting counts below one.
+    
+    Args:
+        value: Raw command line value
+        
+    Returns:
+        Number of worker processes
+    """
+    import argparse
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {workers}")
+    return workers
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(
@@ -19,6 +39,8 @@ Examples:
   python analyze_trace.py trace.json --keep-query-params
   python analyze_trace.py trace.json --include-gateways
   python analyze_trace.py trace.json --include-service-mesh
+  python analyze_trace.py trace.json --workers 4
+  python analyze_trace.py trace.json --fast-parse
         """
     )
     parser.add_argument('input_file', help='Path to the trace JSON file')
@@ -28,12 +50,18 @@ Examples:
                        help='Include gateway/proxy services with only CLIENT spans')
     parser.add_argument('--include-service-mesh', action='store_true',
                        help='Include service mesh sidecar spans (Istio/Envoy)')
+    parser.add_argument('--workers', type=_worker_count, default=1,
+                       help='Number of processes used to analyze traces (default: 1)')
+    parser.add_argument('--fast-parse', action='store_true',
+                       help='Parse the whole file in memory instead of streaming it')
     args = parser.parse_args()
     
     analyzer = TraceAnalyzer(
         strip_query_params=not args.keep_query_params,
         include_gateway_services=args.include_gateways,
-        include_service_mesh=args.include_service_mesh
+        include_service_mesh=args.include_service_mesh,
+        workers=args.workers,
+        fast_parse=args.fast_parse
     )
     
     try:
@@ -41,7 +69,9 @@ Examples:
         print(f"  Input file: {args.input_file}")
         print(f"  Strip query params: {not args.keep_query_params}")
         print(f"  Include gateway services: {args.include_gateways}")
-        print(f"  Include service mesh: {args.include_service_mesh}\n")
+        print(f"  Include service mesh: {args.include_service_mesh}")
+        print(f"  Workers: {args.workers}")
+        print(f"  Fast parse: {args.fast_parse}\n")
         analyzer.process_trace_file(args.input_file)
         print(f"\n✓ Analysis complete!")
     except FileNotFoundError:
@@ -52,8 +52,8 @@ def format_file_size(size_bytes: int) -> str:
 
 def get_analysis_summary(analyzer: TraceAnalyzer) -> dict:
     """Extract summary metrics from analyzer for logging."""
-    trace_count = len(analyzer.traces) if analyzer.traces else 0
-    span_count = sum(len(spans) for spans in analyzer.traces.values()) if analyzer.traces else 0
+    trace_count = len(analyzer.trace_summary)
+    span_count = sum(summary['span_count'] for summary in analyzer.trace_summary.values())
     service_count = len(set(
         v.get('service', 'unknown') 
         for d in [analyzer.endpoint_params, analyzer.service_calls, analyzer.kafka_messages]
@@ -70,6 +70,20 @@ class TestTraceAnalyzerIntegration:
         # Check that processing completed and we have data
         assert len(analyzer.endpoint_params) > 0 or len(analyzer.service_calls) > 0
     
+    def test_hierarchies_carry_no_internal_node_fields(self):
+        """Test that per-node analysis caches do not end up in the serialized hierarchies."""
+        test_file = Path(__file__).parent.parent.parent / "sample-trace.json"
+        
+        if not test_file.exists():
+            pytest.skip("sample-trace.json not found")
+        
+        analyzer = TraceAnalyzer()
+        analyzer.process_trace_file(str(test_file))
+        
+        serialized = json.dumps(analyzer.trace_hierarchies, default=str)
+        for key in ('_http_path', '_http_method', '_parent_kind'):
+            assert key not in serialized
+    
     def test_analyzer_with_sample_trace_file(self, sample_trace_file):
         """Test analyzer with a simple generated trace file."""
         analyzer = TraceAnalyzer()
@@ -78,6 +92,60 @@ class TestTraceAnalyzerIntegration:
         # Should process without errors
         assert True
     
+    def test_worker_pool_matches_serial_analysis(self):
+        """Test that analyzing traces in worker processes gives the serial results."""
+        test_file = Path(__file__).parent.parent.parent / "sample-trace.json"
+        
+        if not test_file.exists():
+            pytest.skip("sample-trace.json not found")
+        
+        serial = TraceAnalyzer()
+        serial.process_trace_file(str(test_file))
+        pooled = TraceAnalyzer(workers=2)
+        pooled.process_trace_file(str(test_file))
+        
+        assert pooled.endpoint_params == serial.endpoint_params
+        assert pooled.service_calls == serial.service_calls
+        assert pooled.kafka_messages == serial.kafka_messages
+        assert pooled.effective_times == serial.effective_times
+        assert pooled.trace_summary == serial.trace_summary
+        assert pooled.trace_hierarchies == serial.trace_hierarchies
+    
+    def test_deep_call_chain_does_not_hit_recursion_limit(self, tmp_path):
+        """Test that a call chain deeper than the recursion limit is fully analyzed."""
+        depth = 3000
+        batches = []
+        for i in range(depth):
+            span = {
+                "traceId": "deep",
+                "spanId": f"s{i}",
+                "name": f"op{i}",
+                "kind": "SPAN_KIND_INTERNAL",
+                "startTimeUnixNano": i,
+                "endTimeUnixNano": 2 * depth - i,
+            }
+            if i:
+                span["parentSpanId"] = f"s{i - 1}"
+            # Runs of same-service spans are lifted as sidecar duplicates
+            service = "svc-a" if (i // 3) % 2 == 0 else "svc-b"
+            batches.append({
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                "instrumentationLibrarySpans": [{"spans": [span]}],
+            })
+        trace_file = tmp_path / "deep.json"
+        trace_file.write_text(json.dumps({"batches": batches}))
+        
+        analyzer = TraceAnalyzer()
+        analyzer.process_trace_file(str(trace_file))
+        
+        node = analyzer.trace_hierarchies["deep"]
+        levels = 0
+        while node["children"]:
+            node = node["children"][0]
+            levels += 1
+        # One span per run of three same-service spans is kept
+        assert levels == depth // 3
+    
     def test_empty_trace_file(self, tmp_path):
         """Test handling of empty trace file."""
         empty_file = tmp_path / "empty.json"
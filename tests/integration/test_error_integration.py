@@ -39,6 +39,11 @@ class TestErrorIntegration:
         for endpoint_data in error_endpoints.values():
             assert 'error_messages' in endpoint_data
             assert len(endpoint_data['error_messages']) > 0
+        
+        # Endpoints without errors never allocate a message table
+        for endpoint_data in analyzer.endpoint_params.values():
+            if endpoint_data['error_count'] == 0:
+                assert endpoint_data['error_messages'] is None
     
     # @pytest.mark.skip(reason="Test needs update for batches format - error detection already tested in test_sample_trace_error_detection")
     def test_error_trace_with_empty_messages(self):
@@ -133,7 +138,7 @@ class TestErrorIntegration:
         
         # Check traces for error information
         assert hasattr(analyzer, 'traces')
-        assert len(analyzer.traces) > 0
+        assert len(analyzer.trace_summary) > 0
         
         # Find a hierarchy with errors
         found_error_node = False
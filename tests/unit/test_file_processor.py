@@ -0,0 +1,116 @@
+"""
+Unit tests for trace_analyzer.processors.file_processor module.
+"""
+from trace_analyzer.processors.file_processor import TraceFileProcessor
+
+
+def make_batch(service_name, spans):
+    """Helper to create a Grafana/Tempo-format batch."""
+    return {
+        "resource": {
+            "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]
+        },
+        "instrumentationLibrarySpans": [{"spans": spans}]
+    }
+
+
+class TestTraceFileProcessor:
+    """Tests for the TraceFileProcessor class."""
+    
+    def test_groups_spans_by_trace_id(self, temp_json_file):
+        """Test that spans from different batches are grouped by traceId."""
+        path = temp_json_file({"batches": [
+            make_batch("svc-a", [{"traceId": "t1", "spanId": "a"}, {"traceId": "t2", "spanId": "b"}]),
+            make_batch("svc-b", [{"traceId": "t1", "spanId": "c"}]),
+        ]})
+        
+        traces = TraceFileProcessor.process_file(path)
+        
+        assert sorted(traces) == ["t1", "t2"]
+        assert [s["spanId"] for s in traces["t1"]] == ["a", "c"]
+        assert [s["_service_name"] for s in traces["t1"]] == ["svc-a", "svc-b"]
+    
+    def test_spans_without_trace_id_are_skipped(self, temp_json_file):
+        """Test that spans missing a traceId are ignored."""
+        path = temp_json_file({"batches": [
+            make_batch("svc-a", [{"spanId": "a"}, {"traceId": "t1", "spanId": "b"}]),
+        ]})
+        
+        traces = TraceFileProcessor.process_file(path)
+        
+        assert list(traces) == ["t1"]
+        assert len(traces["t1"]) == 1
+    
+    def test_unused_span_fields_are_dropped(self, temp_json_file):
+        """Test that only the fields the analysis reads are retained."""
+        path = temp_json_file({"batches": [
+            make_batch("svc-a", [{
+                "traceId": "t1",
+                "spanId": "a",
+                "name": "GET /x",
+                "events": [{"name": "log", "attributes": []}],
+                "links": [],
+                "droppedAttributesCount": 0,
+            }]),
+        ]})
+        
+        span = TraceFileProcessor.process_file(path)["t1"][0]
+        
+        assert span["name"] == "GET /x"
+        assert "events" not in span
+        assert "links" not in span
+        assert "droppedAttributesCount" not in span
+        assert "resource" not in span
+    
+    def test_streaming_and_in_memory_parsing_match(self, temp_json_file, mocker):
+        """Test that files streamed with ijson parse the same as in-memory loads."""
+        path = temp_json_file({"batches": [
+            make_batch("svc-a", [{"traceId": "t1", "spanId": "a", "startTimeUnixNano": 1.5}]),
+            make_batch("svc-b", [{"traceId": "t1", "spanId": "b", "kind": "SPAN_KIND_SERVER"}]),
+        ]})
+        
+        mocker.patch(
+            "trace_analyzer.processors.file_processor._fits_in_memory", return_value=True
+        )
+        in_memory = TraceFileProcessor.process_file(path)
+        mocker.patch(
+            "trace_analyzer.processors.file_processor._fits_in_memory", return_value=False
+        )
+        streamed = TraceFileProcessor.process_file(path)
+        
+        assert streamed == in_memory
+    
+    def test_top_level_array_yields_no_traces(self, temp_json_file, mocker):
+        """Test that a top-level JSON array parses as an empty file either way."""
+        path = temp_json_file([])
+        
+        for fits_in_memory in (True, False):
+            mocker.patch(
+                "trace_analyzer.processors.file_processor._fits_in_memory",
+                return_value=fits_in_memory,
+            )
+            assert TraceFileProcessor.process_file(path) == {}
+    
+    def test_null_batches_yield_no_traces(self, temp_json_file, mocker):
+        """Test that "batches": null parses as an empty file either way."""
+        path = temp_json_file({"batches": None})
+        
+        for fits_in_memory in (True, False):
+            mocker.patch(
+                "trace_analyzer.processors.file_processor._fits_in_memory",
+                return_value=fits_in_memory,
+            )
+            assert TraceFileProcessor.process_file(path) == {}
+    
+    def test_fast_parse_skips_streaming(self, temp_json_file, mocker):
+        """Test that fast_parse loads the file in memory even when it looks too large."""
+        path = temp_json_file({"batches": [make_batch("svc-a", [{"traceId": "t1", "spanId": "a"}])]})
+        
+        mocker.patch(
+            "trace_analyzer.processors.file_processor._fits_in_memory", return_value=False
+        )
+        stream = mocker.patch.object(TraceFileProcessor, "_stream_batches")
+        traces = TraceFileProcessor.process_file(path, fast_parse=True)
+        
+        stream.assert_not_called()
+        assert [s["spanId"] for s in traces["t1"]] == ["a"]
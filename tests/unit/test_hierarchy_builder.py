@@ -0,0 +1,60 @@
+"""
+Unit tests for trace_analyzer.processors.hierarchy_builder module.
+"""
+import pytest
+from trace_analyzer.extractors.http_extractor import HttpExtractor
+from trace_analyzer.processors.hierarchy_builder import HierarchyBuilder
+
+
+def make_span(span_id, service, parent=None, kind='SPAN_KIND_INTERNAL'):
+    """Helper to create a span whose service comes from its resource attributes."""
+    span = {
+        'spanId': span_id,
+        'name': span_id,
+        'kind': kind,
+        'startTimeUnixNano': 1_000_000,
+        'endTimeUnixNano': 3_000_000,
+        'resource': {
+            'attributes': [{'key': 'service.name', 'value': {'stringValue': service}}]
+        },
+    }
+    if parent:
+        span['parentSpanId'] = parent
+    return span
+
+
+class TestHierarchyBuilder:
+    """Tests for the HierarchyBuilder class."""
+    
+    @pytest.fixture
+    def builder(self):
+        """Create a builder with a real HTTP extractor."""
+        return HierarchyBuilder(HttpExtractor())
+    
+    def test_children_linked_to_parents(self, builder):
+        """Test that spans are attached to their parent regardless of order."""
+        spans = [
+            make_span('child', 'svc-a', parent='root'),
+            make_span('root', 'svc-a', kind='SPAN_KIND_SERVER'),
+        ]
+        
+        root, span_nodes = builder.build_raw_hierarchy(spans)
+        
+        assert [n['span']['spanId'] for n in root['children']] == ['root']
+        assert span_nodes['root']['children'] == [span_nodes['child']]
+        assert span_nodes['child']['_parent_kind'] == 'SPAN_KIND_SERVER'
+        assert span_nodes['root']['_parent_kind'] is None
+    
+    def test_orphan_adopted_by_service_server_span(self, builder):
+        """Test that a span with a missing parent is adopted by its service's SERVER span."""
+        spans = [
+            make_span('server', 'svc-a', kind='SPAN_KIND_SERVER'),
+            make_span('orphan', 'svc-a', parent='missing'),
+            make_span('other', 'svc-b', parent='missing'),
+        ]
+        
+        root, span_nodes = builder.build_raw_hierarchy(spans)
+        
+        assert span_nodes['server']['children'] == [span_nodes['orphan']]
+        assert span_nodes['orphan']['_parent_kind'] is None
+        assert [n['span']['spanId'] for n in root['children']] == ['server', 'other']
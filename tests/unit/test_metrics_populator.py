@@ -0,0 +1,68 @@
+"""
+Unit tests for trace_analyzer.processors.metrics_populator module.
+"""
+from trace_analyzer.core.types import TraceConfig
+from trace_analyzer.extractors import HttpExtractor, KafkaExtractor, PathNormalizer
+from trace_analyzer.processors.metrics_populator import MetricsPopulator
+
+
+def make_attributes(**kwargs):
+    """Helper to create OpenTelemetry-format attributes."""
+    return [{"key": k.replace("_", "."), "value": {"stringValue": v}} for k, v in kwargs.items()]
+
+
+def make_node(span_id, kind, service_name, parent_span_id="", **http):
+    """Helper to create a timed node without the fields HierarchyBuilder adds."""
+    return {
+        'span': {
+            'spanId': span_id,
+            'parentSpanId': parent_span_id,
+            'name': 'span',
+            'kind': kind,
+            'startTimeUnixNano': 1_000_000,
+            'endTimeUnixNano': 2_000_000,
+            'attributes': make_attributes(**http),
+        },
+        'service_name': service_name,
+        'children': [],
+        'total_time_ms': 1.0,
+        'self_time_ms': 1.0,
+    }
+
+
+class TestMetricsPopulator:
+    """Tests for the MetricsPopulator class."""
+    
+    def make_populator(self):
+        """Create a populator with default configuration."""
+        return MetricsPopulator(
+            TraceConfig(), HttpExtractor(), KafkaExtractor(), PathNormalizer()
+        )
+    
+    def test_http_attributes_read_from_span_when_not_captured(self):
+        """Test that nodes built elsewhere have their HTTP attributes scanned from the span."""
+        span_nodes = {
+            'root': make_node('root', 'SPAN_KIND_SERVER', 'gateway',
+                              http_method='GET', http_target='/api/orders/42'),
+            'call': make_node('call', 'SPAN_KIND_CLIENT', 'gateway', parent_span_id='root',
+                              http_method='GET', http_url='http://billing.ns/api/charge'),
+        }
+        
+        endpoint_params, service_calls, _, _ = self.make_populator().populate_flat_metrics(span_nodes)
+        
+        assert list(endpoint_params) == [('gateway', 'GET', '/api/orders/{id}', '42')]
+        assert list(service_calls) == [('gateway', 'billing', 'GET', '/api/charge', '[no-params]')]
+    
+    def test_parent_kind_derived_from_span_nodes_when_not_captured(self):
+        """Test that the parent kind is looked up by parent span id for nodes built elsewhere."""
+        span_nodes = {
+            'root': make_node('root', 'SPAN_KIND_SERVER', 'gateway',
+                              http_method='GET', http_target='/api/orders/42'),
+            'sidecar': make_node('sidecar', 'SPAN_KIND_SERVER', 'gateway', parent_span_id='root',
+                                 http_method='GET', http_target='/api/orders/7'),
+        }
+        
+        endpoint_params, _, _, _ = self.make_populator().populate_flat_metrics(span_nodes)
+        
+        # The SERVER span under a SERVER parent is a sidecar hop and is not counted
+        assert list(endpoint_params) == [('gateway', 'GET', '/api/orders/{id}', '42')]
@@ -2,7 +2,8 @@
 Unit tests for trace_analyzer.extractors.path_normalizer module.
 """
 import pytest
-from trace_analyzer.extractors.path_normalizer import PathNormalizer
+from urllib.parse import urlparse
+from trace_analyzer.extractors.path_normalizer import PathNormalizer, _url_path
 
 
 class TestPathNormalizer:
@@ -158,3 +159,74 @@ class TestPathNormalizer:
         normalized, params = normalizer.normalize_path(path)
         assert "{id}" in normalized
         assert "{version}" not in normalized
+    
+    def test_rule_identifier_param_order(self):
+        """Test that params are grouped by type: rule ids before numeric ids."""
+        normalizer = PathNormalizer()
+        
+        path = "/api/items/42/rules/Rule-X__abc_1"
+        normalized, params = normalizer.normalize_path(path)
+        assert normalized == "/api/items/{id}/rules/{rule_id}"
+        assert params == ["Rule-X__abc_1", "42"]
+    
+    def test_replacement_targets_matched_segment(self):
+        """Test that the matched segment is replaced, not an earlier look-alike prefix."""
+        normalizer = PathNormalizer()
+        
+        path = "/v/5x/5"
+        normalized, params = normalizer.normalize_path(path)
+        assert normalized == "/v/5x/{id}"
+        assert params == ["5"]
+    
+    def test_long_segment_containing_uuid_keeps_uuid(self):
+        """Test that a long segment wrapping a UUID is not treated as an encoded id."""
+        normalizer = PathNormalizer()
+        
+        path = "/api/abc-550e8400-e29b-41d4-a716-446655440000/x"
+        normalized, params = normalizer.normalize_path(path)
+        assert normalized == "/api/abc-{uuid}/x"
+        assert params == []
+    
+    def test_repeated_paths_are_cached(self):
+        """Test that normalizing the same path twice hits the cache."""
+        normalizer = PathNormalizer()
+        
+        first = normalizer.normalize_path("/api/orders/12345/items")
+        second = normalizer.normalize_path("/api/orders/12345/items")
+        assert first == second
+        assert normalizer.cache_info().hits == 1
+    
+    def test_cached_params_are_independent_lists(self):
+        """Test that mutating a returned params list does not affect later calls."""
+        normalizer = PathNormalizer()
+        
+        _, params = normalizer.normalize_path("/api/orders/12345")
+        params.append("mutated")
+        _, params_again = normalizer.normalize_path("/api/orders/12345")
+        assert params_again == ["12345"]
+    
+    def test_url_path_matches_urlparse(self):
+        """Test that the URL path slicing agrees with urlparse, including edge cases."""
+        urls = [
+            "http://svc.ns.svc:8080/api/users/42?x=1#frag",
+            "https://user:pw@host/a/b",
+            "http://host",
+            "http://host?q=/not/path",
+            "http:///only/path",
+            "//host/rel://x",
+            "http://host/a;params/b;last?x",
+            "http://[::1]:8080/v6/path",
+            " http://host/leading/space",
+            "/login?redirect=http://auth/callback",
+        ]
+        for url in urls:
+            assert _url_path(url) == urlparse(url).path, url
+    
+    def test_static_paths_skip_only_when_no_pattern_can_match(self):
+        """Test that the static-path shortcut leaves parameter-bearing paths alone."""
+        normalizer = PathNormalizer()
+        long_segment = "a" * 30
+        
+        assert normalizer.normalize_path("/api/health/status") == ("/api/health/status", [])
+        assert normalizer.normalize_path(f"/api/{long_segment}") == ("/api/{encoded_id}", [long_segment])
+        assert normalizer.normalize_path("/api/orders/٣") == ("/api/orders/{id}", ["٣"])
@@ -302,3 +302,50 @@ class TestSelfTimeWithParallelism:
         # Wall clock should equal cumulative (no parallelism)
         assert node['children_wall_clock_ms'] == pytest.approx(120.0, abs=0.1)
         assert node['parallelism_factor'] == 1.0  # No significant parallelism
+
+
+class TestDeepHierarchies:
+    """Tests for hierarchies deeper than the interpreter recursion limit."""
+    
+    @staticmethod
+    def make_chain(depth):
+        """Build a linear chain of nested nodes, each 1ms shorter than its parent."""
+        root = None
+        for level in reversed(range(depth)):
+            root = {
+                'span': {'name': f'call-{level}'},
+                'service_name': f'service-{level}',
+                'total_time_ms': float(depth - level),
+                'self_time_ms': float(depth - level),
+                'start_time_ns': level * 500_000,
+                'end_time_ns': level * 500_000 + (depth - level) * 1_000_000,
+                'children': [root] if root else []
+            }
+        return root
+    
+    def test_calculate_hierarchy_timings_deep_chain(self):
+        """Test that very deep call chains are processed without recursion errors."""
+        from trace_analyzer.processors.aggregator import NodeAggregator
+        from trace_analyzer.extractors.http_extractor import HttpExtractor
+        from trace_analyzer.extractors.path_normalizer import PathNormalizer
+        
+        calculator = TimingCalculator(NodeAggregator(HttpExtractor(), PathNormalizer()))
+        root = self.make_chain(5000)
+        
+        calculator.calculate_hierarchy_timings(root)
+        
+        # Each child starts 0.5ms after its parent and ends 0.5ms before it
+        assert root['self_time_ms'] == pytest.approx(1.0)
+        assert root['children'][0]['self_time_ms'] == pytest.approx(1.0)
+    
+    def test_recalculate_self_times_deep_chain(self):
+        """Test that self-times are recalculated bottom-up on very deep chains."""
+        root = self.make_chain(5000)
+        
+        TimingCalculator.recalculate_self_times(root)
+        
+        leaf = root
+        while leaf['children']:
+            leaf = leaf['children'][0]
+        assert root['self_time_ms'] == pytest.approx(1.0)
+        assert leaf['self_time_ms'] == leaf['total_time_ms']
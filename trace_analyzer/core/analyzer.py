@@ -2,10 +2,18 @@
 Main trace analyzer orchestrator.
 """
 
+import multiprocessing
 from collections import defaultdict
-from typing import DefaultDict, Tuple
+from typing import DefaultDict, Dict, List, Tuple
 
-from ..core.types import TraceConfig, EndpointStats, KafkaStats
+from ..core.types import (
+    TraceConfig,
+    EndpointStats,
+    KafkaStats,
+    add_error_message,
+    new_endpoint_stats,
+    new_kafka_stats,
+)
 from ..extractors import HttpExtractor, KafkaExtractor, PathNormalizer
 from ..processors import (
     TraceFileProcessor,
@@ -17,6 +25,40 @@ from ..processors import (
 )
 from ..formatters import format_time
 
+# Traces handed to a worker process per round trip
+WORKER_CHUNK_SIZE = 64
+
+# Analyzer used by pool worker processes, created once per worker
+_worker_analyzer = None
+
+
+def _init_worker(config: TraceConfig):
+    """
+    Create the per-process analyzer used by pool workers.
+    
+    Args:
+        config: Configuration of the parent analyzer
+    """
+    global _worker_analyzer
+    _worker_analyzer = TraceAnalyzer(
+        strip_query_params=config.strip_query_params,
+        include_gateway_services=config.include_gateway_services,
+        include_service_mesh=config.include_service_mesh
+    )
+
+
+def _analyze_in_worker(spans: List[Dict]) -> Tuple:
+    """
+    Analyze a single trace inside a pool worker.
+    
+    Args:
+        spans: All spans belonging to the trace
+        
+    Returns:
+        Result tuple of TraceAnalyzer._analyze_trace
+    """
+    return _worker_analyzer._analyze_trace(spans)
+
 
 class TraceAnalyzer:
     """Main orchestrator for trace analysis."""
@@ -25,7 +67,9 @@ class TraceAnalyzer:
         self,
         strip_query_params: bool = True,
         include_gateway_services: bool = False,
-        include_service_mesh: bool = False
+        include_service_mesh: bool = False,
+        workers: int = 1,
+        fast_parse: bool = False
     ):
         """
         Initialize the TraceAnalyzer.
@@ -34,6 +78,8 @@ class TraceAnalyzer:
             strip_query_params: If True, removes query parameters from URLs before analysis
             include_gateway_services: If True, includes services that only have CLIENT spans
             include_service_mesh: If True, includes service mesh sidecar spans
+            workers: Number of processes used to analyze traces (1 = in-process)
+            fast_parse: If True, always parse trace files in memory rather than streaming
         """
         # Configuration
         self.config = TraceConfig(
@@ -41,34 +87,13 @@ class TraceAnalyzer:
             include_gateway_services=include_gateway_services,
             include_service_mesh=include_service_mesh
         )
+        self.workers = max(1, workers)
+        self.fast_parse = fast_parse
         
         # Data structures for flat analysis
-        self.endpoint_params: DefaultDict[Tuple, EndpointStats] = defaultdict(
-            lambda: {
-                'count': 0,
-                'total_time_ms': 0.0,
-                'total_self_time_ms': 0.0,
-                'error_count': 0,
-                'error_messages': defaultdict(int)
-            }
-        )
-        self.service_calls: DefaultDict[Tuple, EndpointStats] = defaultdict(
-            lambda: {
-                'count': 0,
-                'total_time_ms': 0.0,
-                'total_self_time_ms': 0.0,
-                'error_count': 0,
-                'error_messages': defaultdict(int)
-            }
-        )
-        self.kafka_messages: DefaultDict[Tuple, KafkaStats] = defaultdict(
-            lambda: {
-                'count': 0,
-                'total_time_ms': 0.0,
-                'error_count': 0,
-                'error_messages': defaultdict(int)
-            }
-        )
+        self.endpoint_params: DefaultDict[Tuple, EndpointStats] = defaultdict(new_endpoint_stats)
+        self.service_calls: DefaultDict[Tuple, EndpointStats] = defaultdict(new_endpoint_stats)
+        self.kafka_messages: DefaultDict[Tuple, KafkaStats] = defaultdict(new_kafka_stats)
         
         # Data structures for hierarchical analysis
         self.traces = {}
@@ -113,11 +138,14 @@ class TraceAnalyzer:
         Process the trace JSON file by first grouping all spans by traceId,
         then building a hierarchy for each trace.
         
+        Each trace's raw spans are released from self.traces once it has been
+        analyzed; per-trace span counts remain available in self.trace_summary.
+        
         Args:
             file_path: Path to the trace JSON file
         """
         # Step 1: Read and group spans by trace ID
-        self.traces = self.file_processor.process_file(file_path)
+        self.traces = self.file_processor.process_file(file_path, self.fast_parse)
         
         # Step 2: Process each trace
         self._process_collected_traces()
@@ -139,73 +167,130 @@ class TraceAnalyzer:
         """
         Iterate through each collected trace, build its hierarchy, calculate
         timings, and then populate the flat metrics for the summary tables.
+        
+        With more than one worker, traces are analyzed in a process pool and
+        the per-trace results are merged here in the original trace order.
+        
+        Spans are popped from self.traces as they are handed out, so a trace's
+        raw spans can be freed as soon as it has been analyzed.
         """
-        for trace_id, spans in self.traces.items():
-            # Pass 1 & 2: Build the raw hierarchy and a flat map of all nodes
-            raw_hierarchy, span_nodes = self.hierarchy_builder.build_raw_hierarchy(spans)
-            
-            # Pass 3: Recursively calculate timings for the entire hierarchy
-            if raw_hierarchy:
-                self.timing_calculator.calculate_hierarchy_timings(raw_hierarchy)
-            
-            # Pass 4: Populate the flat summary tables
-            ep, sc, km, eff = self.metrics_populator.populate_flat_metrics(span_nodes)
-            
-            # Merge results into analyzer's collections
-            for key, stats in ep.items():
-                self.endpoint_params[key]['count'] += stats['count']
-                self.endpoint_params[key]['total_time_ms'] += stats['total_time_ms']
-                self.endpoint_params[key]['total_self_time_ms'] += stats['total_self_time_ms']
-                self.endpoint_params[key]['error_count'] += stats['error_count']
-                for msg, count in stats['error_messages'].items():
-                    self.endpoint_params[key]['error_messages'][msg] += count
-            
-            for key, stats in sc.items():
-                self.service_calls[key]['count'] += stats['count']
-                self.service_calls[key]['total_time_ms'] += stats['total_time_ms']
-                self.service_calls[key]['total_self_time_ms'] += stats['total_self_time_ms']
-                self.service_calls[key]['error_count'] += stats['error_count']
-                for msg, count in stats['error_messages'].items():
-                    self.service_calls[key]['error_messages'][msg] += count
-            
-            for key, stats in km.items():
-                self.kafka_messages[key]['count'] += stats['count']
-                self.kafka_messages[key]['total_time_ms'] += stats['total_time_ms']
-                self.kafka_messages[key]['error_count'] += stats['error_count']
-                for msg, count in stats['error_messages'].items():
-                    self.kafka_messages[key]['error_messages'][msg] += count
-            
-            # Merge effective times (for multi-trace analysis, we need to merge intervals)
-            # For now, we take the max effective time per key across traces
-            for category in ['endpoints', 'service_calls', 'kafka', 'services']:
-                for key, eff_time in eff.get(category, {}).items():
-                    if key not in self.effective_times[category]:
-                        self.effective_times[category][key] = eff_time
-                    else:
-                        # For multi-trace, sum the effective times (they don't overlap across traces)
-                        self.effective_times[category][key] += eff_time
-            
-            # Pass 5: Normalize and aggregate the raw hierarchy
-            normalized_hierarchy = self.hierarchy_normalizer.normalize_and_aggregate_hierarchy(raw_hierarchy)
+        trace_ids = list(self.traces)
+        pending_spans = (self.traces.pop(trace_id) for trace_id in trace_ids)
+        
+        if self.workers > 1 and len(trace_ids) > 1:
+            with multiprocessing.Pool(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            ) as pool:
+                results = pool.imap(
+                    _analyze_in_worker, pending_spans, chunksize=WORKER_CHUNK_SIZE
+                )
+                for trace_id, result in zip(trace_ids, results):
+                    self._merge_trace_result(trace_id, result)
+        else:
+            for trace_id, spans in zip(trace_ids, pending_spans):
+                self._merge_trace_result(trace_id, self._analyze_trace(spans))
+    
+    def _analyze_trace(self, spans: List[Dict]) -> Tuple:
+        """
+        Run the per-trace analysis passes for a single trace.
+        
+        Args:
+            spans: All spans belonging to the trace
             
-            # Store the normalized hierarchy for the UI
-            self.trace_hierarchies[trace_id] = normalized_hierarchy
+        Returns:
+            Tuple of (endpoint_params, service_calls, kafka_messages,
+            effective_times, normalized_hierarchy, trace_summary)
+        """
+        # Pass 1 & 2: Build the raw hierarchy and a flat map of all nodes
+        raw_hierarchy, span_nodes = self.hierarchy_builder.build_raw_hierarchy(spans)
+        
+        # Pass 3: Recursively calculate timings for the entire hierarchy
+        if raw_hierarchy:
+            self.timing_calculator.calculate_hierarchy_timings(raw_hierarchy)
+        
+        # Pass 4: Populate the flat summary tables
+        ep, sc, km, eff = self.metrics_populator.populate_flat_metrics(span_nodes)
+        
+        # Pass 5: Normalize and aggregate the raw hierarchy
+        normalized_hierarchy = self.hierarchy_normalizer.normalize_and_aggregate_hierarchy(raw_hierarchy)
+        
+        # Trace summary
+        summary = None
+        if spans:
+            start_times = [s.get('startTimeUnixNano', 0) for s in spans]
+            end_times = [s.get('endTimeUnixNano', 0) for s in spans]
+            min_start_time = min(start_times) if start_times else 0
+            max_end_time = max(end_times) if end_times else 0
+            wall_clock_duration = (max_end_time - min_start_time) / 1_000_000.0
             
-            # Store trace summary
-            if spans:
-                start_times = [s.get('startTimeUnixNano', 0) for s in spans]
-                end_times = [s.get('endTimeUnixNano', 0) for s in spans]
-                min_start_time = min(start_times) if start_times else 0
-                max_end_time = max(end_times) if end_times else 0
-                wall_clock_duration = (max_end_time - min_start_time) / 1_000_000.0
-                
-                self.trace_summary[trace_id] = {
-                    'start_time_unix_nano': min_start_time,
-                    'end_time_unix_nano': max_end_time,
-                    'wall_clock_duration_ms': wall_clock_duration,
-                    'wall_clock_duration_formatted': format_time(wall_clock_duration),
-                    'span_count': len(spans)
-                }
+            summary = {
+                'start_time_unix_nano': min_start_time,
+                'end_time_unix_nano': max_end_time,
+                'wall_clock_duration_ms': wall_clock_duration,
+                'wall_clock_duration_formatted': format_time(wall_clock_duration),
+                'span_count': len(spans)
+            }
+        
+        return ep, sc, km, eff, normalized_hierarchy, summary
+    
+    def _merge_trace_result(self, trace_id: str, result: Tuple) -> None:
+        """
+        Merge the analysis result of a single trace into the analyzer state.
+        
+        Args:
+            trace_id: ID of the analyzed trace
+            result: Tuple returned by _analyze_trace
+        """
+        ep, sc, km, eff, normalized_hierarchy, summary = result
+        
+        # Merge results into analyzer's collections
+        self._merge_stats(self.endpoint_params, ep)
+        self._merge_stats(self.service_calls, sc)
+        self._merge_stats(self.kafka_messages, km)
+        
+        # Merge effective times (for multi-trace analysis, we need to merge intervals)
+        # For now, we take the max effective time per key across traces
+        for category in ['endpoints', 'service_calls', 'kafka', 'services']:
+            for key, eff_time in eff.get(category, {}).items():
+                if key not in self.effective_times[category]:
+                    self.effective_times[category][key] = eff_time
+                else:
+                    # For multi-trace, sum the effective times (they don't overlap across traces)
+                    self.effective_times[category][key] += eff_time
+        
+        # Store the normalized hierarchy for the UI
+        self.trace_hierarchies[trace_id] = normalized_hierarchy
+        
+        # Store trace summary
+        if summary is not None:
+            self.trace_summary[trace_id] = summary
+    
+    @staticmethod
+    def _merge_stats(target: DefaultDict[Tuple, Dict], source: Dict[Tuple, Dict]) -> None:
+        """
+        Merge one trace's stats table into the analyzer-wide table.
+        
+        Keys seen for the first time adopt the per-trace record as-is instead of
+        allocating a fresh record and copying into it; the per-trace tables are
+        discarded after merging, so nothing else references them.
+        
+        Args:
+            target: Analyzer-wide stats table (modified in-place)
+            source: Stats table produced for a single trace
+        """
+        for key, stats in source.items():
+            existing = target.get(key)
+            if existing is None:
+                target[key] = stats
+                continue
+            for field, value in stats.items():
+                if field == 'error_messages':
+                    for msg, count in (value or {}).items():
+                        add_error_message(existing, msg, count)
+                else:
+                    existing[field] += value
     
     def format_time(self, ms: float) -> str:
         """
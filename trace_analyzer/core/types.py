@@ -2,7 +2,7 @@
 Type definitions for trace analysis.
 """
 
-from typing import TypedDict, DefaultDict
+from typing import Dict, Optional, TypedDict
 
 
 class EndpointStats(TypedDict):
@@ -11,7 +11,7 @@ class EndpointStats(TypedDict):
     total_time_ms: float
     total_self_time_ms: float
     error_count: int
-    error_messages: DefaultDict[str, int]
+    error_messages: Optional[Dict[str, int]]
 
 
 class KafkaStats(TypedDict):
@@ -19,7 +19,46 @@ class KafkaStats(TypedDict):
     count: int
     total_time_ms: float
     error_count: int
-    error_messages: DefaultDict[str, int]
+    error_messages: Optional[Dict[str, int]]
+
+
+def new_endpoint_stats() -> EndpointStats:
+    """Create an empty EndpointStats record (default factory for stats tables)."""
+    return {
+        'count': 0,
+        'total_time_ms': 0.0,
+        'total_self_time_ms': 0.0,
+        'error_count': 0,
+        'error_messages': None
+    }
+
+
+def new_kafka_stats() -> KafkaStats:
+    """Create an empty KafkaStats record (default factory for stats tables)."""
+    return {
+        'count': 0,
+        'total_time_ms': 0.0,
+        'error_count': 0,
+        'error_messages': None
+    }
+
+
+def add_error_message(stats: Dict, message: str, count: int = 1) -> None:
+    """
+    Count occurrences of an error message on a stats record.
+    
+    Most records never see an error, so their message table is only
+    allocated on first use; a record without errors keeps None.
+    
+    Args:
+        stats: EndpointStats or KafkaStats record (modified in-place)
+        message: Error message to count
+        count: Number of occurrences to add
+    """
+    messages = stats['error_messages']
+    if messages is None:
+        messages = stats['error_messages'] = {}
+    messages[message] = messages.get(message, 0) + count
 
 
 class TraceConfig:
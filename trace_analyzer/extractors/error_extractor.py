@@ -8,6 +8,8 @@ to avoid generic "Unknown Error" messages when status.message is empty.
 import re
 from typing import Dict, Optional, Tuple
 
+_URL_PATH_RE = re.compile(r'https?://[^/]+(/[^?]*)')
+
 
 class ErrorExtractor:
     """Extracts detailed error information from OpenTelemetry spans."""
@@ -118,7 +120,7 @@ class ErrorExtractor:
         if http_method and http_url and span_name in [http_method, f'HTTP {http_method}', 'HTTP']:
             # Span name is generic, construct from URL
             # Extract path from URL (remove domain and query params)
-            path_match = re.search(r'https?://[^/]+(/[^?]*)', http_url)
+            path_match = _URL_PATH_RE.search(http_url)
             if path_match:
                 path = path_match.group(1)
                 # Truncate very long paths
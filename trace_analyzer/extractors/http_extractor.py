@@ -2,9 +2,79 @@
 HTTP information extraction from OpenTelemetry span attributes.
 """
 
-from typing import List, Dict
+import string
+import sys
+from typing import List, Dict, Tuple
 from urllib.parse import urlparse
 
+# Characters urllib accepts in a URL scheme
+_SCHEME_CHARS = frozenset(string.ascii_letters + string.digits + '+-.')
+
+# Attributes holding an actual request path/URL, used when http.route is absent
+_HTTP_PATH_KEYS = frozenset(('http.url', 'http.target', 'http.path'))
+
+# Methods recognized at the start of a span name when http.method is missing
+HTTP_METHODS = frozenset(('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'))
+
+# Narrower set the display normalizer accepts from span names
+_DISPLAY_SPAN_NAME_METHODS = frozenset(('GET', 'POST', 'PUT', 'DELETE', 'PATCH'))
+
+
+def split_url(url: str) -> int:
+    """
+    Locate the authority (host) part of an absolute URL without urlparse.
+    
+    URLs that urlparse cleans up before splitting (leading whitespace or
+    control characters, embedded tabs and line breaks) are not located here;
+    callers must hand those to urlparse.
+    
+    Args:
+        url: URL or path string
+        
+    Returns:
+        Index where the authority starts, or -1 if url has no scheme://authority
+        or needs urlparse
+    """
+    scheme_end = url.find('://')
+    if scheme_end == -1:
+        return -1
+    if url[0] <= ' ' or '\t' in url or '\r' in url or '\n' in url:
+        return -1
+    if url.startswith('//'):
+        # Scheme-relative reference ("//host/path")
+        return 2
+    if scheme_end == 0 or not _SCHEME_CHARS.issuperset(url[:scheme_end]) or not url[0].isalpha():
+        return -1
+    return scheme_end + 3
+
+
+def _extract_hostname(url: str, host_start: int) -> str:
+    """
+    Extract the lowercased hostname the way urlparse(url).hostname does.
+    
+    Args:
+        url: Absolute URL
+        host_start: Index where the authority starts (from split_url)
+        
+    Returns:
+        Hostname without userinfo or port, or empty string if there is none
+    """
+    host_end = len(url)
+    for delimiter in '/?#':
+        index = url.find(delimiter, host_start, host_end)
+        if index != -1:
+            host_end = index
+    netloc = url[host_start:host_end]
+    host_info = netloc.rpartition('@')[2]
+    _, open_bracket, bracketed = host_info.partition('[')
+    if open_bracket:
+        host = bracketed.partition(']')[0]
+    else:
+        host = host_info.partition(':')[0]
+    # Like urlparse, keep the case of an IPv6 zone id after '%'
+    host, percent, zone = host.partition('%')
+    return host.lower() + percent + zone
+
 
 class HttpExtractor:
     """Extracts HTTP-related information from span attributes."""
@@ -22,20 +92,18 @@ class HttpExtractor:
         Returns:
             HTTP path/URL string or empty string if not found
         """
-        # First check for http.route (normalized template path like /users/{id})
+        # Single pass: a non-empty http.route (normalized template path like
+        # /users/{id}) wins immediately; otherwise remember the first actual path
+        fallback = None
         for attr in attributes:
-            if attr.get('key') == 'http.route':
-                value = attr.get('value', {})
-                route = value.get('stringValue', '')
+            key = attr.get('key')
+            if key == 'http.route':
+                route = attr.get('value', {}).get('stringValue', '')
                 if route:
                     return route
-        
-        # Fall back to actual path attributes
-        for attr in attributes:
-            if attr.get('key') in ['http.url', 'http.target', 'http.path']:
-                value = attr.get('value', {})
-                return value.get('stringValue', '')
-        return ''
+            elif fallback is None and key in _HTTP_PATH_KEYS:
+                fallback = attr.get('value', {}).get('stringValue', '')
+        return fallback or ''
     
     @staticmethod
     def extract_http_method(attributes: List[Dict]) -> str:
@@ -50,9 +118,73 @@ class HttpExtractor:
         """
         for attr in attributes:
             if attr.get('key') == 'http.method':
-                return attr.get('value', {}).get('stringValue', '')
+                # A handful of methods key every aggregation; share one object each
+                return sys.intern(attr.get('value', {}).get('stringValue', ''))
         return ''
     
+    @staticmethod
+    def extract_http_info(attributes: List[Dict]) -> Tuple[str, str]:
+        """
+        Extract HTTP path and method from span attributes in a single scan.
+        
+        Equivalent to calling extract_http_path and extract_http_method, but
+        walks the attribute list only once.
+        
+        Args:
+            attributes: List of span attribute dictionaries
+            
+        Returns:
+            Tuple of (http_path, http_method); each is an empty string if not found
+        """
+        route = None
+        fallback = None
+        method = None
+        for attr in attributes:
+            key = attr.get('key')
+            if key == 'http.route':
+                if not route:
+                    route = attr.get('value', {}).get('stringValue', '')
+            elif key == 'http.method':
+                if method is None:
+                    method = attr.get('value', {}).get('stringValue', '')
+            elif fallback is None and key in _HTTP_PATH_KEYS:
+                fallback = attr.get('value', {}).get('stringValue', '')
+        return route or fallback or '', sys.intern(method) if method else ''
+    
+    @staticmethod
+    def extract_method_from_span_name(span_name: str) -> str:
+        """
+        Extract an HTTP method from a span name such as 'GET /api/users'.
+        
+        Args:
+            span_name: Name of the span
+            
+        Returns:
+            The span name's first word if it is a known HTTP method, else empty string
+        """
+        first_word = span_name.partition(' ')[0]
+        return first_word if first_word in HTTP_METHODS else ''
+    
+    @staticmethod
+    def extract_display_method_from_span_name(span_name: str) -> str:
+        """
+        Extract an HTTP method from a span name for display names.
+        
+        Stricter than extract_method_from_span_name: HEAD and OPTIONS are not
+        recognized, and the method must be followed by a space, so a bare 'GET'
+        does not count. The display hierarchy has always grouped spans this way,
+        and widening the rule would regroup existing traces.
+        
+        Args:
+            span_name: Name of the span
+            
+        Returns:
+            The span name's first word if it is a display method followed by a
+            space, else empty string
+        """
+        first_word, sep, _ = span_name.partition(' ')
+        return first_word if sep and first_word in _DISPLAY_SPAN_NAME_METHODS else ''
+    
     @staticmethod
     def extract_service_name(resource_attributes: List[Dict]) -> str:
         """
@@ -67,7 +199,8 @@ class HttpExtractor:
         for attr in resource_attributes:
             if attr.get('key') == 'service.name':
                 value = attr.get('value', {})
-                return value.get('stringValue', 'unknown-service')
+                # Service names key every aggregation table; share one object per name
+                return sys.intern(value.get('stringValue', 'unknown-service'))
         return 'unknown-service'
     
     @staticmethod
@@ -81,8 +214,13 @@ class HttpExtractor:
         Returns:
             Service name extracted from hostname or 'unknown-service'
         """
-        if '://' in url:
+        if '://' not in url:
+            return 'unknown-service'
+        host_start = split_url(url)
+        if host_start == -1:
             host = urlparse(url).hostname
-            if host:
-                return host.split('.')[0]
+        else:
+            host = _extract_hostname(url, host_start)
+        if host:
+            return sys.intern(host.partition('.')[0])
         return 'unknown-service'
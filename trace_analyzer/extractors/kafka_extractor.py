@@ -4,6 +4,9 @@ Kafka and messaging information extraction from OpenTelemetry spans.
 
 from typing import List, Dict, Tuple
 
+# Span attributes reported in the details column
+_DETAIL_KEYS = frozenset(('amf-service-id', 'amf-message-id', 'Kafka client', 'Message Uuid'))
+
 
 class KafkaExtractor:
     """Extracts Kafka/messaging-related information from spans."""
@@ -33,14 +36,13 @@ class KafkaExtractor:
         elif span_kind == 'SPAN_KIND_PRODUCER':
             operation_type = 'producer'
         
-        # Extract relevant attributes for details
+        # Extract relevant attributes for details, in the order the span lists them;
+        # values of other keys are never read
         details_parts = []
         for attr in attributes:
             key = attr.get('key', '')
-            value = attr.get('value', {})
-            string_value = value.get('stringValue', '')
-            
-            if key in ['amf-service-id', 'amf-message-id', 'Kafka client', 'Message Uuid']:
+            if key in _DETAIL_KEYS:
+                string_value = attr.get('value', {}).get('stringValue', '')
                 if string_value:
                     details_parts.append(f"{key}={string_value}")
         
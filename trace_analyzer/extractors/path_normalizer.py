@@ -3,25 +3,105 @@ URL path normalization and parameter extraction.
 """
 
 import re
+import sys
+from functools import lru_cache
 from typing import Tuple, List
 from urllib.parse import urlparse
 
+from .http_extractor import split_url
+
+# Number of distinct (path, strip_query_params) results memoized per normalizer
+NORMALIZE_CACHE_SIZE = 65536
+
+# Every pattern needs an ASCII digit, uppercase letter or dash, except an
+# encoded identifier, which needs a segment of at least this many characters
+# (non-ASCII paths always go through the regex, since \d matches any digit)
+_TRIGGER_CHARS = frozenset('0123456789-ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_MIN_ENCODED_ID_LENGTH = 30
+
+# Explicit hex classes instead of case-insensitive matching
+_HEX = '[0-9a-fA-F]'
+_UUID = rf'{_HEX}{{8}}-{_HEX}{{4}}-{_HEX}{{4}}-{_HEX}{{4}}-{_HEX}{{12}}'
+
+# One alternation walks the path once and yields disjoint matches.
+# Order matters: a rule identifier wins over a long encoded segment,
+# and a long encoded segment never swallows a UUID inside it.
+_PARAMETER_RE = re.compile(
+    rf'(?P<uuid>{_UUID})'
+    r'|(?P<rule_id>/[A-Z][A-Za-z0-9-]*__[A-Za-z0-9_]+(?=/|\?|$))'
+    rf'|(?P<encoded_id>/(?![A-Za-z0-9_-]*{_UUID})[A-Za-z0-9_-]{{{_MIN_ENCODED_ID_LENGTH},}}(?=/|\?|$))'
+    r'|(?P<version>/\d+\.\d+\.\d+(?:\.\d+)?(?=/|\?|$))'
+    r'|(?P<id>/\d+(?=/|\?|$))'
+)
+
+
+def _is_static_path(path: str) -> bool:
+    """
+    Cheaply check that no parameter pattern can match anywhere in a path.
+    
+    Args:
+        path: Path string, possibly with a query string
+        
+    Returns:
+        True if normalization would leave the path unchanged
+    """
+    return (path.isascii() and _TRIGGER_CHARS.isdisjoint(path) and
+            max(map(len, path.split('/'))) < _MIN_ENCODED_ID_LENGTH)
+
+
+def _url_path(url: str) -> str:
+    """
+    Return urlparse(url).path for a URL containing '://', slicing directly
+    for plain scheme://host/path URLs.
+    
+    Inputs urlparse treats specially (path parameters, IPv6 or non-ASCII
+    hosts, whitespace and control characters) are left to urlparse.
+    
+    Args:
+        url: URL string containing '://'
+        
+    Returns:
+        Path component of the URL
+    """
+    host_start = split_url(url)
+    if host_start == -1:
+        return urlparse(url).path
+    
+    end = len(url)
+    for delimiter in '?#':
+        index = url.find(delimiter, host_start, end)
+        if index != -1:
+            end = index
+    path_start = url.find('/', host_start, end)
+    if path_start == -1:
+        path_start = end
+    
+    netloc = url[host_start:path_start]
+    path = url[path_start:end]
+    if '[' in netloc or ']' in netloc or not netloc.isascii() or ';' in path:
+        return urlparse(url).path
+    return path
+
 
 class PathNormalizer:
     """Normalizes URL paths by replacing dynamic parameters with placeholders."""
     
+    # Placeholder emitted for each named group of the combined pattern
+    PLACEHOLDERS = {
+        'uuid': '{uuid}',
+        'rule_id': '/{rule_id}',
+        'encoded_id': '/{encoded_id}',
+        'version': '/{version}',
+        'id': '/{id}',
+    }
+    
+    # Combined pattern for all parameter types, compiled once per process
+    parameter_pattern = _PARAMETER_RE
+    
     def __init__(self):
-        """Initialize regex patterns for various parameter types."""
-        self.uuid_pattern = re.compile(
-            r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}',
-            re.IGNORECASE
-        )
-        self.numeric_id_pattern = re.compile(r'/\d+(?=/|\?|$)')
-        self.rule_identifier_pattern = re.compile(
-            r'/[A-Z][A-Za-z0-9-]*__[A-Za-z0-9_]+(?=/|\?|$)'
-        )
-        self.long_encoded_pattern = re.compile(r'/[A-Za-z0-9_-]{30,}(?=/|\?|$)')
-        self.semver_pattern = re.compile(r'/\d+\.\d+\.\d+(?:\.\d+)?(?=/|\?|$)')
+        """Initialize the per-instance normalization cache."""
+        # Traces repeat the same raw URLs heavily, so memoize per instance
+        self._normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize)
     
     def normalize_path(self, path: str, strip_query_params: bool = True) -> Tuple[str, List[str]]:
         """
@@ -40,65 +120,58 @@ class PathNormalizer:
         if not path:
             return path, []
         
+        normalized, non_uuid_params = self._normalize_cached(path, strip_query_params)
+        return normalized, list(non_uuid_params)
+    
+    def cache_info(self):
+        """Return hit/miss statistics of the normalization cache."""
+        return self._normalize_cached.cache_info()
+    
+    def _normalize(self, path: str, strip_query_params: bool) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Uncached normalization; returns params as a tuple so results can be shared.
+        
+        Args:
+            path: Non-empty URL or path string to normalize
+            strip_query_params: If True, removes query parameters from the path
+            
+        Returns:
+            Tuple of (normalized_path, non_uuid_params)
+        """
         # If it's a full URL, parse it to get only the path
         if '://' in path:
-            path = urlparse(path).path
+            path = _url_path(path)
         
-        # Strip query parameters if requested
-        if strip_query_params and '?' in path:
-            path = path.split('?')[0]
+        # Strip query parameters if requested (one scan, no intermediate list)
+        if strip_query_params:
+            path = path.partition('?')[0]
         
-        non_uuid_params = []
-        normalized = path
+        # Static paths (no digits, uppercase, dashes or long segments) skip the regex
+        if _is_static_path(path):
+            return sys.intern(path), ()
         
-        # Replace UUIDs with {uuid}
-        uuid_matches = list(self.uuid_pattern.finditer(path))
-        for match in uuid_matches:
-            normalized = normalized.replace(match.group(0), '{uuid}', 1)
+        # Parameters are reported grouped by type, in this order
+        params_by_type = {'rule_id': [], 'encoded_id': [], 'version': [], 'id': []}
+        seen_values = set()
         
-        # Replace rule identifiers with {rule_id}
-        rule_matches = list(self.rule_identifier_pattern.finditer(path))
-        for match in rule_matches:
-            param_value = match.group(0)[1:]  # Remove leading slash
-            non_uuid_params.append(param_value)
-            normalized = normalized.replace(match.group(0), '/{rule_id}', 1)
+        def replace(match):
+            kind = match.lastgroup
+            if kind == 'uuid':
+                return '{uuid}'
+            param_value = match.group(kind)[1:]  # Remove leading slash
+            if kind in ('version', 'id'):
+                # Repeated version/numeric values are reported once and only
+                # their first occurrence is replaced
+                if param_value in seen_values:
+                    return match.group(0)
+                seen_values.add(param_value)
+            params_by_type[kind].append(param_value)
+            return self.PLACEHOLDERS[kind]
         
-        # Replace long encoded strings with {encoded_id}
-        long_encoded_matches = list(self.long_encoded_pattern.finditer(path))
-        for match in long_encoded_matches:
-            param_value = match.group(0)[1:]  # Remove leading slash
-            
-            # Check if this match overlaps with UUID or rule matches
-            is_already_matched = False
-            for uuid_match in uuid_matches:
-                if (match.start() <= uuid_match.start() < match.end() or
-                        uuid_match.start() <= match.start() < uuid_match.end()):
-                    is_already_matched = True
-                    break
-            
-            if not is_already_matched:
-                for rule_match in rule_matches:
-                    if (match.start() <= rule_match.start() < match.end() or
-                            rule_match.start() <= match.start() < rule_match.end()):
-                        is_already_matched = True
-                        break
-            
-            if not is_already_matched:
-                non_uuid_params.append(param_value)
-                normalized = normalized.replace(match.group(0), '/{encoded_id}', 1)
-        
-        # Replace semantic version strings (e.g., 4.3.8, 1.0.0.1) with {version}
-        for match in self.semver_pattern.finditer(path):
-            param_value = match.group(0)[1:]  # Remove leading slash
-            if param_value not in non_uuid_params:
-                non_uuid_params.append(param_value)
-                normalized = normalized.replace(match.group(0), '/{version}', 1)
+        normalized = _PARAMETER_RE.sub(replace, path)
         
-        # Replace numeric IDs with {id}
-        for match in self.numeric_id_pattern.finditer(path):
-            param_value = match.group(0)[1:]  # Remove leading slash
-            if param_value not in non_uuid_params:
-                non_uuid_params.append(param_value)
-                normalized = normalized.replace(match.group(0), '/{id}', 1)
-        
-        return normalized, non_uuid_params
+        # Results become dictionary key parts; interning makes repeats share one object
+        non_uuid_params = tuple(
+            sys.intern(p) for params in params_by_type.values() for p in params
+        )
+        return sys.intern(normalized), non_uuid_params
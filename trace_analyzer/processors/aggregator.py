@@ -44,31 +44,32 @@ class NodeAggregator:
             if '_display_method' in node and '_display_path' in node:
                 http_method = node['_display_method']
                 normalized_path = node['_display_path']
-                aggregation_key = f"{service}:{http_method}:{normalized_path}"
+                aggregation_key = (service, http_method, normalized_path)
             else:
-                # Extract from span attributes
-                http_path = self.http_extractor.extract_http_path(span.get('attributes', []))
+                # Use the HTTP attributes captured when the node was built,
+                # scanning the span attributes only for nodes built elsewhere
+                http_path = node.get('_http_path')
+                if http_path is None:
+                    http_path = self.http_extractor.extract_http_path(span.get('attributes', []))
                 
                 if http_path:
-                    http_method = self.http_extractor.extract_http_method(span.get('attributes', []))
+                    http_method = node.get('_http_method')
+                    if http_method is None:
+                        http_method = self.http_extractor.extract_http_method(span.get('attributes', []))
                     # Default to method from span name if missing
                     if not http_method:
-                        span_name = span.get('name', '')
-                        for method in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']:
-                            if span_name.startswith(method + ' ') or span_name == method:
-                                http_method = method
-                                break
-                        if not http_method:
-                            http_method = 'POST'  # Default to POST instead of UNKNOWN
+                        http_method = self.http_extractor.extract_method_from_span_name(
+                            span.get('name', '')
+                        ) or 'POST'  # Default to POST instead of UNKNOWN
                     
                     normalized_path, _ = self.path_normalizer.normalize_path(http_path)
-                    aggregation_key = f"{service}:{http_method}:{normalized_path}"
+                    aggregation_key = (service, http_method, normalized_path)
                     # Store method and path for display
                     node['_display_method'] = http_method
                     node['_display_path'] = normalized_path
                 else:
                     # Non-HTTP span (Kafka, database, internal)
-                    aggregation_key = f"{service}:{span.get('name', 'Unknown Span')}"
+                    aggregation_key = (service, span.get('name', 'Unknown Span'))
             
             aggregated_nodes[aggregation_key].append(node)
         
@@ -105,7 +106,7 @@ class NodeAggregator:
                     display_name = f"{group[0]['_display_method']} {group[0]['_display_path']}"
                     http_method = group[0]['_display_method']
                 else:
-                    display_name = key
+                    display_name = ':'.join(map(str, key))
                     http_method = None
                 
                 agg_node = {
@@ -116,6 +117,8 @@ class NodeAggregator:
                     },
                     'service_name': group[0]['service_name'],
                     'http_method': http_method,
+                    '_http_path': group[0].get('_http_path'),
+                    '_http_method': group[0].get('_http_method'),
                     'children': all_grandchildren,
                     'total_time_ms': total_time,
                     'self_time_ms': self_time,
@@ -2,48 +2,189 @@
 JSON trace file processing using streaming parser.
 """
 
+import json
+import logging
+import os
+import sys
+
 import ijson
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+from ..extractors.http_extractor import HttpExtractor
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used for in-memory parsing
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred ijson backends, fastest first. The C extension tokenizes in tight
+# native loops; the pure-Python backend is only used when nothing else loads.
+IJSON_BACKEND_PREFERENCE = ('yajl2_c', 'yajl2_cffi', 'yajl2', 'python')
+
+# Read size handed to the parser; larger chunks mean fewer Python round trips
+READ_BUFFER_SIZE = 1 << 20
+
+# Files smaller than available memory divided by this factor are parsed in one
+# shot. Peak use while loading compact OTLP JSON measures 7-8.5x the file size
+# with json or orjson: the raw bytes, the parsed document (about 6x) and the
+# projected span copies all live at once before the document is released.
+IN_MEMORY_PARSE_FACTOR = 10
+
+# Span fields read by the analysis; everything else (events, links, ...) is
+# dropped as soon as the batch is parsed so it is not retained per trace.
+# The batch resource is not kept either: spans carry its service name instead.
+SPAN_FIELDS = (
+    'traceId',
+    'spanId',
+    'parentSpanId',
+    'name',
+    'kind',
+    'startTimeUnixNano',
+    'endTimeUnixNano',
+    'attributes',
+    'status',
+)
+
+
+def _load_ijson_backend():
+    """
+    Load the fastest available ijson backend.
+    
+    Returns:
+        ijson backend module
+    """
+    for name in IJSON_BACKEND_PREFERENCE:
+        try:
+            return ijson.get_backend(name)
+        except ImportError:
+            continue
+    return ijson
+
+
+ijson_backend = _load_ijson_backend()
+logger.debug(f"Using ijson backend: {ijson_backend.backend}")
+
+
+def _available_memory() -> int:
+    """
+    Return the available physical memory in bytes, or 0 when it is unknown.
+    
+    Returns:
+        Available memory in bytes
+    """
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def _fits_in_memory(file_path: str) -> bool:
+    """
+    Decide whether a trace file is small enough to parse in memory.
+    
+    Args:
+        file_path: Path to the trace JSON file
+        
+    Returns:
+        True if the whole document can be loaded at once
+    """
+    return os.path.getsize(file_path) * IN_MEMORY_PARSE_FACTOR < _available_memory()
 
 
 class TraceFileProcessor:
     """Processes OpenTelemetry trace JSON files using streaming parser."""
     
     @staticmethod
-    def process_file(file_path: str) -> Dict[str, List[Dict]]:
+    def process_file(file_path: str, fast_parse: bool = False) -> Dict[str, List[Dict]]:
         """
         Process a trace JSON file and group spans by traceId.
         
         Args:
             file_path: Path to the trace JSON file
+            fast_parse: If True, always parse the whole file in memory instead of
+                streaming it when it looks too large for available memory
             
         Returns:
             Dictionary mapping trace_id -> list of spans
         """
         traces = defaultdict(list)
         
-        print(f"Processing {file_path}...")
+        if fast_parse or _fits_in_memory(file_path):
+            parser_name = 'orjson' if orjson is not None else 'json'
+            batches = TraceFileProcessor._load_batches(file_path)
+        else:
+            parser_name = f"ijson {ijson_backend.backend}"
+            batches = TraceFileProcessor._stream_batches(file_path)
         
-        with open(file_path, 'rb') as f:
-            parser = ijson.items(f, 'batches.item')
-            batch_count, span_count = 0, 0
+        print(f"Processing {file_path} ({parser_name})...")
+        
+        batch_count, span_count = 0, 0
+        
+        for batch in batches:
+            batch_count += 1
+            # All spans of a batch share its resource, so resolve the service once
+            service_name = HttpExtractor.extract_service_name(
+                batch.get('resource', {}).get('attributes', [])
+            )
+            for inst_lib_span in batch.get('instrumentationLibrarySpans', []):
+                for span in inst_lib_span.get('spans', []):
+                    span_count += 1
+                    trace_id = span.get('traceId')
+                    if trace_id:
+                        span = {k: span[k] for k in SPAN_FIELDS if k in span}
+                        span['_service_name'] = service_name
+                        kind = span.get('kind')
+                        if isinstance(kind, str):
+                            # Every pass branches on the kind; one shared object per
+                            # kind saves memory and lets comparisons hit the identity check
+                            span['kind'] = sys.intern(kind)
+                        traces[trace_id].append(span)
             
-            for batch in parser:
-                batch_count += 1
-                for inst_lib_span in batch.get('instrumentationLibrarySpans', []):
-                    for span in inst_lib_span.get('spans', []):
-                        span_count += 1
-                        trace_id = span.get('traceId')
-                        if trace_id:
-                            # Attach resource info to span for later service name extraction
-                            span['resource'] = batch.get('resource', {})
-                            traces[trace_id].append(span)
-                
-                if batch_count % 100 == 0:
-                    print(f"  Read {batch_count} batches, {span_count} spans...")
+            if batch_count % 100 == 0:
+                print(f"  Read {batch_count} batches, {span_count} spans...")
         
         print(f"Completed reading file: {batch_count} batches, {span_count} spans found.")
         print(f"Found {len(traces)} unique traces.")
         
         return dict(traces)
+    
+    @staticmethod
+    def _load_batches(file_path: str) -> Iterator[Dict]:
+        """
+        Parse the whole trace file at once and yield its batches.
+        
+        Documents without a batches list (a top-level array, "batches": null)
+        yield nothing, as the streaming parser does.
+        
+        Args:
+            file_path: Path to the trace JSON file
+            
+        Yields:
+            Batch dictionaries
+        """
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        del raw
+        batches = data.get('batches') if isinstance(data, dict) else None
+        if isinstance(batches, list):
+            yield from batches
+    
+    @staticmethod
+    def _stream_batches(file_path: str) -> Iterator[Dict]:
+        """
+        Stream batches from a trace file too large to parse in memory.
+        
+        Args:
+            file_path: Path to the trace JSON file
+            
+        Yields:
+            Batch dictionaries
+        """
+        with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            yield from ijson_backend.items(
+                f, 'batches.item', buf_size=READ_BUFFER_SIZE, use_float=True
+            )
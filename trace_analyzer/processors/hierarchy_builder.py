@@ -4,6 +4,8 @@ Hierarchy builder for trace spans.
 
 from typing import Dict, List, Tuple
 
+from ..extractors.error_extractor import ErrorExtractor
+
 
 class HierarchyBuilder:
     """Builds tree structure from flat list of spans."""
@@ -32,6 +34,9 @@ class HierarchyBuilder:
         """
         span_nodes = {}
         service_server_spans = {}
+        extract_service_name = self.http_extractor.extract_service_name
+        extract_http_info = self.http_extractor.extract_http_info
+        extract_error_details = ErrorExtractor.extract_error_details
         
         # First pass: create nodes and identify the primary SERVER span for each service
         for span in spans:
@@ -42,13 +47,19 @@ class HierarchyBuilder:
             start_time_ns = span.get('startTimeUnixNano', 0)
             end_time_ns = span.get('endTimeUnixNano', 0)
             duration_ms = (end_time_ns - start_time_ns) / 1_000_000.0
-            service_name = self.http_extractor.extract_service_name(
-                span.get('resource', {}).get('attributes', [])
-            )
+            # The file processor resolves the service once per batch; spans
+            # built elsewhere still carry their resource
+            service_name = span.get('_service_name')
+            if service_name is None:
+                service_name = extract_service_name(
+                    span.get('resource', {}).get('attributes', [])
+                )
             
             # Extract error information using intelligent extraction
-            from ..extractors.error_extractor import ErrorExtractor
-            is_error, error_message, http_status_code = ErrorExtractor.extract_error_details(span)
+            is_error, error_message, http_status_code = extract_error_details(span)
+            
+            # HTTP attributes are read by several later passes; scan them once here
+            http_path, http_method = extract_http_info(span.get('attributes', []))
 
             
             span_nodes[span_id] = {
@@ -62,6 +73,8 @@ class HierarchyBuilder:
                 'is_error': is_error,
                 'error_message': error_message,
                 'http_status_code': http_status_code,
+                '_http_path': http_path,
+                '_http_method': http_method,
             }
             
             if (span.get('kind') == 'SPAN_KIND_SERVER' and 
@@ -72,15 +85,20 @@ class HierarchyBuilder:
         root_spans = []
         for span_id, node in span_nodes.items():
             parent_span_id = node['span'].get('parentSpanId')
+            parent_node = span_nodes.get(parent_span_id) if parent_span_id else None
+            
+            if parent_node is not None:
+                # Normal case: parent exists; the metrics pass filters on its kind
+                node['_parent_kind'] = parent_node['span'].get('kind')
+                parent_node['children'].append(node)
+                continue
             
-            if parent_span_id and parent_span_id in span_nodes:
-                # Normal case: parent exists
-                span_nodes[parent_span_id]['children'].append(node)
-            elif (node['service_name'] in service_server_spans and 
-                  span_id != service_server_spans[node['service_name']]):
+            # Adopted orphans keep no parent kind: their recorded parent is missing
+            node['_parent_kind'] = None
+            adopter_id = service_server_spans.get(node['service_name'])
+            if adopter_id is not None and span_id != adopter_id:
                 # Orphan: adopt it to the service's SERVER span
-                parent_id = service_server_spans[node['service_name']]
-                span_nodes[parent_id]['children'].append(node)
+                span_nodes[adopter_id]['children'].append(node)
             else:
                 # True root span
                 root_spans.append(node)
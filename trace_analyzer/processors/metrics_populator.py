@@ -4,6 +4,8 @@ Metrics populator for flat summary tables.
 
 from typing import Dict
 from collections import defaultdict
+from ..core.types import add_error_message, new_endpoint_stats, new_kafka_stats
+from ..extractors.error_extractor import ErrorExtractor
 from ..formatters.interval_merger import calculate_effective_times
 from .normalizer import (
     _normalize_path_for_matching,
@@ -11,6 +13,9 @@ from .normalizer import (
     _extract_absorbed_values,
 )
 
+# Span kinds recorded in the Kafka/messaging table
+_MESSAGING_SPAN_KINDS = frozenset(('SPAN_KIND_CONSUMER', 'SPAN_KIND_PRODUCER'))
+
 
 def _merge_fuzzy_metrics(metrics_dict, intervals_dict, path_index):
     """Merge flat-table entries whose paths are fuzzy-equal.
@@ -33,10 +38,7 @@ def _merge_fuzzy_metrics(metrics_dict, intervals_dict, path_index):
         match_path = _normalize_path_for_matching(original_path)
         context_groups[context].append((key, match_path, original_path, original_param))
 
-    merged_metrics = defaultdict(lambda: {
-        'count': 0, 'total_time_ms': 0.0, 'total_self_time_ms': 0.0,
-        'error_count': 0, 'error_messages': defaultdict(int),
-    })
+    merged_metrics = defaultdict(new_endpoint_stats)
     merged_intervals = defaultdict(list)
 
     for context, entries in context_groups.items():
@@ -82,8 +84,8 @@ def _merge_fuzzy_metrics(metrics_dict, intervals_dict, path_index):
                 merged_metrics[new_key]['total_time_ms'] += old['total_time_ms']
                 merged_metrics[new_key]['total_self_time_ms'] += old.get('total_self_time_ms', 0.0)
                 merged_metrics[new_key]['error_count'] += old.get('error_count', 0)
-                for msg, cnt in old.get('error_messages', {}).items():
-                    merged_metrics[new_key]['error_messages'][msg] += cnt
+                for msg, cnt in (old.get('error_messages') or {}).items():
+                    add_error_message(merged_metrics[new_key], msg, cnt)
                 merged_intervals[new_key].extend(intervals_dict.get(old_key, []))
 
     return merged_metrics, merged_intervals
@@ -123,18 +125,9 @@ class MetricsPopulator:
               - 'kafka': {key: effective_ms}
               - 'services': {service_name: effective_ms}
         """
-        endpoint_params = defaultdict(lambda: {
-            'count': 0, 'total_time_ms': 0.0, 'total_self_time_ms': 0.0,
-            'error_count': 0, 'error_messages': defaultdict(int)
-        })
-        service_calls = defaultdict(lambda: {
-            'count': 0, 'total_time_ms': 0.0, 'total_self_time_ms': 0.0,
-            'error_count': 0, 'error_messages': defaultdict(int)
-        })
-        kafka_messages = defaultdict(lambda: {
-            'count': 0, 'total_time_ms': 0.0,
-            'error_count': 0, 'error_messages': defaultdict(int)
-        })
+        endpoint_params = defaultdict(new_endpoint_stats)
+        service_calls = defaultdict(new_endpoint_stats)
+        kafka_messages = defaultdict(new_kafka_stats)
         
         # Interval collectors for effective time calculation
         endpoint_intervals = defaultdict(list)
@@ -151,14 +144,40 @@ class MetricsPopulator:
                 if span_kind == 'SPAN_KIND_SERVER':
                     services_with_server_spans.add(node['service_name'])
         
+        # Bind per-span lookups to locals once; the loop below runs for every span
+        extract_error_details = ErrorExtractor.extract_error_details
+        extract_http_path = self.http_extractor.extract_http_path
+        extract_http_method = self.http_extractor.extract_http_method
+        extract_target_service = self.http_extractor.extract_target_service_from_url
+        extract_method_from_span_name = self.http_extractor.extract_method_from_span_name
+        extract_kafka_info = self.kafka_extractor.extract_kafka_info
+        normalize_path = self.path_normalizer.normalize_path
+        strip_query_params = self.config.strip_query_params
+        include_service_mesh = self.config.include_service_mesh
+        include_gateway_services = self.config.include_gateway_services
+        
         for span_id, node in span_nodes.items():
             span = node['span']
-            attributes = span.get('attributes', [])
             span_kind = span.get('kind', '')
             
-            parent_span_id = span.get('parentSpanId')
-            parent_node = span_nodes.get(parent_span_id)
-            parent_kind = parent_node['span'].get('kind') if parent_node else None
+            # The parent kind recorded by HierarchyBuilder is only read here; pop it
+            # so it does not end up in the serialized hierarchy. Nodes built
+            # elsewhere look their parent up by span id instead.
+            if '_parent_kind' in node:
+                parent_kind = node.pop('_parent_kind')
+            else:
+                parent_node = span_nodes.get(span.get('parentSpanId'))
+                parent_kind = parent_node['span'].get('kind') if parent_node else None
+            
+            # Use the HTTP attributes captured when the hierarchy was built,
+            # scanning the span attributes only for nodes built elsewhere
+            http_path = node.get('_http_path')
+            if http_path is None:
+                http_path = extract_http_path(span.get('attributes', []))
+            
+            # Spans that are neither HTTP nor messaging feed no table; skip them early
+            if not http_path and span_kind not in _MESSAGING_SPAN_KINDS:
+                continue
             
             # Read the final, correct time values from the node
             total_time = node['total_time_ms']
@@ -170,36 +189,27 @@ class MetricsPopulator:
             interval = (start_ns, end_ns) if start_ns and end_ns else None
             
             # Use intelligent error extraction
-            from ..extractors.error_extractor import ErrorExtractor
-            is_error, error_message, _ = ErrorExtractor.extract_error_details(span)
+            is_error, error_message, _ = extract_error_details(span)
 
             
-            http_path = self.http_extractor.extract_http_path(attributes)
             if http_path:
-                http_method = self.http_extractor.extract_http_method(attributes)
+                http_method = node.get('_http_method')
+                if http_method is None:
+                    http_method = extract_http_method(span.get('attributes', []))
                 # If method is missing, try to extract from span name or default to UNKNOWN
                 if not http_method:
-                    span_name = span.get('name', '')
-                    # Common HTTP methods that might appear in span names
-                    for method in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']:
-                        if span_name.startswith(method + ' ') or span_name == method:
-                            http_method = method
-                            break
-                    # If still no method found, use UNKNOWN to avoid empty strings
-                    if not http_method:
-                        http_method = 'UNKNOWN'
+                    # Common HTTP methods that might appear in span names;
+                    # if still no method found, use UNKNOWN to avoid empty strings
+                    http_method = extract_method_from_span_name(span.get('name', '')) or 'UNKNOWN'
                 
-                normalized_path, params = self.path_normalizer.normalize_path(
-                    http_path,
-                    self.config.strip_query_params
-                )
+                normalized_path, params = normalize_path(http_path, strip_query_params)
                 param_str = params[0] if params else '[no-params]'
                 
                 # Apply filtering logic for SERVER spans based on configuration
                 should_include_server = False
                 if span_kind == 'SPAN_KIND_SERVER':
                     # Step 1: Check if we should filter out service mesh sidecar duplicates
-                    if self.config.include_service_mesh:
+                    if include_service_mesh:
                         # Include ALL SERVER spans when service mesh is enabled
                         should_include_server = True
                     else:
@@ -207,18 +217,19 @@ class MetricsPopulator:
                         should_include_server = (parent_kind != 'SPAN_KIND_SERVER')
                     
                     # Step 2: Further filter based on gateway_services setting
-                    if not self.config.include_service_mesh and not self.config.include_gateway_services:
+                    if not include_service_mesh and not include_gateway_services:
                         # Strictest mode: Only CLIENT parent or root (no parent)
                         should_include_server = (parent_kind == 'SPAN_KIND_CLIENT' or parent_kind is None)
                 
                 if should_include_server:
                     key = (node['service_name'], http_method, normalized_path, param_str)
-                    endpoint_params[key]['count'] += 1
-                    endpoint_params[key]['total_time_ms'] += total_time
-                    endpoint_params[key]['total_self_time_ms'] += self_time
+                    stats = endpoint_params[key]
+                    stats['count'] += 1
+                    stats['total_time_ms'] += total_time
+                    stats['total_self_time_ms'] += self_time
                     if is_error and error_message:
-                        endpoint_params[key]['error_count'] += 1
-                        endpoint_params[key]['error_messages'][error_message] += 1
+                        stats['error_count'] += 1
+                        add_error_message(stats, error_message)
                     # Collect interval for effective time calculation
                     if interval:
                         endpoint_intervals[key].append(interval)
@@ -227,63 +238,55 @@ class MetricsPopulator:
                 # Apply filtering logic for CLIENT spans based on configuration
                 elif span_kind == 'SPAN_KIND_CLIENT':
                     # When include_gateway_services is True, capture pure gateway services
-                    if self.config.include_gateway_services:
+                    if include_gateway_services:
                         if node['service_name'] not in services_with_server_spans:
                             # Treat this CLIENT span as incoming request to the gateway
                             key = (node['service_name'], http_method, normalized_path, param_str)
-                            endpoint_params[key]['count'] += 1
-                            endpoint_params[key]['total_time_ms'] += total_time
-                            endpoint_params[key]['total_self_time_ms'] += self_time
+                            stats = endpoint_params[key]
+                            stats['count'] += 1
+                            stats['total_time_ms'] += total_time
+                            stats['total_self_time_ms'] += self_time
                             if is_error and error_message:
-                                endpoint_params[key]['error_count'] += 1
-                                endpoint_params[key]['error_messages'][error_message] += 1
+                                stats['error_count'] += 1
+                                add_error_message(stats, error_message)
                             # Collect interval for effective time calculation
                             if interval:
                                 endpoint_intervals[key].append(interval)
                                 service_intervals[node['service_name']].append(interval)
                     
                     # Always track service-to-service calls
-                    if self.config.include_service_mesh:
+                    if include_service_mesh:
                         should_include_client = True
                     else:
                         # Filter out CLIENT→CLIENT chains (app → Envoy sidecar pattern)
                         should_include_client = (parent_kind != 'SPAN_KIND_CLIENT')
                     
                     if should_include_client:
-                        target_service = self.http_extractor.extract_target_service_from_url(http_path)
+                        target_service = extract_target_service(http_path)
                         key = (node['service_name'], target_service, http_method, 
                               normalized_path, param_str)
-                        service_calls[key]['count'] += 1
-                        service_calls[key]['total_time_ms'] += total_time
-                        service_calls[key]['total_self_time_ms'] += self_time
+                        stats = service_calls[key]
+                        stats['count'] += 1
+                        stats['total_time_ms'] += total_time
+                        stats['total_self_time_ms'] += self_time
                         if is_error and error_message:
-                            service_calls[key]['error_count'] += 1
-                            service_calls[key]['error_messages'][error_message] += 1
+                            stats['error_count'] += 1
+                            add_error_message(stats, error_message)
                         # Collect interval for effective time calculation
                         if interval:
                             service_call_intervals[key].append(interval)
             else:
-                op_type, msg_type, details = self.kafka_extractor.extract_kafka_info(span, attributes)
-                if op_type in ['consumer', 'producer']:
-                    key = (node['service_name'], op_type, msg_type, details)
-                    kafka_messages[key]['count'] += 1
-                    kafka_messages[key]['total_time_ms'] += total_time
-                    if is_error and error_message:
-                        kafka_messages[key]['error_count'] += 1
-                        kafka_messages[key]['error_messages'][error_message] += 1
-                    # Collect interval for effective time calculation
-                    if interval:
-                        kafka_intervals[key].append(interval)
-        
-        # Calculate effective times for all groupings
-        effective_times = {
-            'endpoints': calculate_effective_times(endpoint_intervals),
-            'service_calls': calculate_effective_times(service_call_intervals),
-            'kafka': calculate_effective_times(kafka_intervals),
-            'services': calculate_effective_times({(k,): v for k, v in service_intervals.items()})
-        }
-        # Flatten services dict to use service name as key instead of tuple
-        effective_times['services'] = {k[0]: v for k, v in effective_times['services'].items()}
+                op_type, msg_type, details = extract_kafka_info(span, span.get('attributes', []))
+                key = (node['service_name'], op_type, msg_type, details)
+                stats = kafka_messages[key]
+                stats['count'] += 1
+                stats['total_time_ms'] += total_time
+                if is_error and error_message:
+                    stats['error_count'] += 1
+                    add_error_message(stats, error_message)
+                # Collect interval for effective time calculation
+                if interval:
+                    kafka_intervals[key].append(interval)
         
         # Merge entries that represent the same endpoint but have different placeholder
         # names (e.g., {uuid} vs {isolationID}) or un-normalized text slugs vs {param}
@@ -294,8 +297,13 @@ class MetricsPopulator:
             service_calls, service_call_intervals, path_index=3
         )
         
-        # Recalculate effective times after merging
-        effective_times['endpoints'] = calculate_effective_times(endpoint_intervals)
-        effective_times['service_calls'] = calculate_effective_times(service_call_intervals)
+        # Calculate effective times for all groupings (endpoint and service-call
+        # intervals only after merging, since merging changes their keys)
+        effective_times = {
+            'endpoints': calculate_effective_times(endpoint_intervals),
+            'service_calls': calculate_effective_times(service_call_intervals),
+            'kafka': calculate_effective_times(kafka_intervals),
+            'services': calculate_effective_times(service_intervals)
+        }
         
         return endpoint_params, service_calls, kafka_messages, effective_times
@@ -3,6 +3,9 @@ Hierarchy normalizer for display aggregation.
 """
 
 import re
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
 from typing import Dict, List, Optional
 
 _PLACEHOLDER_RE = re.compile(r'\{[^}]+\}')
@@ -92,22 +95,29 @@ class HierarchyNormalizer:
         if not root_node:
             return None
         
+        # Invariant for the whole traversal; decides whether sidecars are filtered at all
+        include_service_mesh = self.config.include_service_mesh
+        
         def normalize_node(node):
             """Normalize a single node's display name."""
             span = node['span']
             attributes = span.get('attributes', [])
             
-            # Extract HTTP information
-            http_path = self.http_extractor.extract_http_path(attributes)
+            # Extract HTTP information, reusing what the hierarchy builder captured.
+            # This is the last pass that reads it, so it is taken off the node and
+            # does not end up in the serialized hierarchy.
+            http_path = node.pop('_http_path', None)
+            http_method = node.pop('_http_method', None)
+            if http_path is None:
+                http_path = self.http_extractor.extract_http_path(attributes)
             if http_path:
-                http_method = self.http_extractor.extract_http_method(attributes)
+                if http_method is None:
+                    http_method = self.http_extractor.extract_http_method(attributes)
                 if not http_method:
-                    # Try to extract from span name
-                    span_name = span.get('name', '')
-                    if span_name.startswith(('GET ', 'POST ', 'PUT ', 'DELETE ', 'PATCH ')):
-                        http_method = span_name.split()[0]
-                    else:
-                        http_method = 'POST'  # Default
+                    # Try to extract from span name, defaulting to POST
+                    http_method = self.http_extractor.extract_display_method_from_span_name(
+                        span.get('name', '')
+                    ) or 'POST'
                 
                 normalized_path, param_values = self.path_normalizer.normalize_path(
                     http_path,
@@ -117,10 +127,11 @@ class HierarchyNormalizer:
                 # Convert param_values list to string
                 param_str = ', '.join(param_values) if param_values else ''
                 
-                # Create display name
-                display_name = f"{http_method} {normalized_path}"
+                # Create display name (a single formatted string, no concatenation)
                 if param_str:
-                    display_name += f" ({param_str})"
+                    display_name = f"{http_method} {normalized_path} ({param_str})"
+                else:
+                    display_name = f"{http_method} {normalized_path}"
                 
                 node['span']['name'] = display_name
                 node['http_method'] = http_method
@@ -136,10 +147,10 @@ class HierarchyNormalizer:
             
             IMPORTANT: Never skip error spans - we want to preserve error information
             in the hierarchy for visibility.
-            """
-            if self.config.include_service_mesh:
-                return False  # Don't skip anything when mesh spans are included
             
+            Only consulted when service mesh spans are excluded; with
+            include_service_mesh nothing is skipped.
+            """
             # Never skip error spans - preserve them for visibility
             if node.get('is_error', False):
                 return False
@@ -157,38 +168,53 @@ class HierarchyNormalizer:
         
         def filter_duplicates_and_lift(children, parent_node):
             """
-            Recursively filter out same-service duplicates and lift their children.
+            Filter out same-service duplicates and lift their children.
             Keep lifting until we find nodes from different services.
+            
+            Skipped nodes are expanded in place with an explicit stack of
+            child iterators, so long sidecar chains do not recurse. children
+            may be any iterable; it is consumed exactly once.
             """
-            if not children:
-                return []
+            if include_service_mesh:
+                # Nothing is skipped when mesh spans are included
+                result = list(children)
+                for child in result:
+                    normalize_node(child)
+                return result
             
             result = []
-            for child in children:
-                normalize_node(child)
-                
-                if should_skip_node(child, parent_node):
-                    # Skip this duplicate and recursively process its children
-                    result.extend(filter_duplicates_and_lift(child.get('children', []), parent_node))
-                else:
+            pending = [iter(children)]
+            while pending:
+                for child in pending[-1]:
+                    normalize_node(child)
+                    
+                    if should_skip_node(child, parent_node):
+                        # Skip this duplicate and process its children in its place
+                        pending.append(iter(child.get('children', [])))
+                        break
                     result.append(child)
+                else:
+                    pending.pop()
             
             return result
         
         def aggregate_siblings(children, parent_node=None, parent_count=1, is_root_level=False):
             """Aggregate sibling nodes with the same normalized endpoint.
             
+            This is a generator driven by run_aggregate_siblings: each nested
+            aggregation is yielded as its argument tuple and its result is sent
+            back, so deep hierarchies do not hit the recursion limit.
+            
             Args:
-                children: List of child nodes to aggregate
+                children: Iterable of child nodes to aggregate
                 parent_node: Parent node (for sidecar filtering)
                 parent_count: Count of parent's aggregation (for parallelism detection)
                 is_root_level: If True, calculate parallelism for aggregated groups
             """
-            if not children:
-                return []
-            
             # First pass: filter out sidecar duplicates and lift their children
             filtered_children = filter_duplicates_and_lift(children, parent_node)
+            if not filtered_children:
+                return []
             
             # Record original order so we can restore it after grouping
             original_index = {id(child): i for i, child in enumerate(filtered_children)}
@@ -198,55 +224,81 @@ class HierarchyNormalizer:
             # merge with paths from raw URLs (normalizer-parameterized).
             # Pre-parameterized paths are sorted first so they establish the {param}
             # template that concrete values (e.g., "Field", "data-model") can match against.
-            groups = {}  # key -> list of children
+            # Most siblings are unique, so a group only gets a member list once a
+            # second child joins it
+            groups = {}  # key -> first child of the group
+            merged = {}  # key -> list of children, for groups with more than one
             canonical_paths = {}  # key -> most-parameterized {param} form (for matching)
             display_paths = {}  # key -> best original path with meaningful names (for display)
-            
+            display_param_counts = {}  # key -> {param} count of the display path's match form
+            # Fuzzy matches need the same service, method and segment count, so each
+            # child only scans the groups in its own bucket (in creation order)
+            candidate_keys = defaultdict(list)  # (service, method, '/' count) -> [key]
+            
+            # filter_duplicates_and_lift has already normalized every child it returns.
+            # Each child's match path and placeholder count are derived once and reused
+            # for sorting, grouping and display-path selection.
+            # The grouping fields are read once here as well; non-HTTP nodes have no
+            # method/path/parameter keys, so they default to empty strings.
+            prepared_children = []
             for child in filtered_children:
-                normalize_node(child)
-            sorted_children = sorted(
-                filtered_children,
-                key=lambda c: -_normalize_path_for_matching(
-                    c.get('normalized_path', '')
-                ).count('{param}'),
-            )
-            
-            for child in sorted_children:
-                service = child.get('service_name', '')
-                method = child.get('http_method', '')
                 path = child.get('normalized_path', '')
-                param = child.get('parameter_value', '')
-                
                 match_path = _normalize_path_for_matching(path)
+                prepared_children.append((
+                    child,
+                    child.get('service_name', ''),
+                    child.get('http_method', ''),
+                    path,
+                    child.get('parameter_value', ''),
+                    match_path,
+                    match_path.count('{param}'),
+                ))
+            prepared_children.sort(key=itemgetter(6), reverse=True)
+            
+            for child, service, method, path, param, match_path, param_count in prepared_children:
+                candidates = candidate_keys[(service, method, match_path.count('/'))]
                 
                 matched_key = None
-                for existing_key in groups:
-                    e_service, e_method, _, e_param = existing_key
+                for existing_key in candidates:
+                    e_param = existing_key[3]
                     e_canonical = canonical_paths[existing_key]
-                    if (service == e_service and method == e_method and
-                        _paths_match_fuzzy(match_path, e_canonical) and
+                    if (_paths_match_fuzzy(match_path, e_canonical) and
                         (param == e_param or not param or not e_param)):
                         matched_key = existing_key
                         break
                 
                 if matched_key is not None:
-                    groups[matched_key].append(child)
+                    members = merged.get(matched_key)
+                    if members is None:
+                        merged[matched_key] = [groups[matched_key], child]
+                    else:
+                        members.append(child)
                     old_canonical = canonical_paths[matched_key]
                     new_canonical = _pick_canonical_path(old_canonical, match_path)
                     canonical_paths[matched_key] = new_canonical
-                    if match_path.count('{param}') > _normalize_path_for_matching(
-                        display_paths[matched_key]
-                    ).count('{param}'):
+                    if param_count > display_param_counts[matched_key]:
                         display_paths[matched_key] = path
+                        display_param_counts[matched_key] = param_count
                 else:
                     key = (service, method, match_path, param)
-                    groups[key] = [child]
+                    groups[key] = child
+                    candidates.append(key)
                     canonical_paths[key] = match_path
                     display_paths[key] = path
+                    display_param_counts[key] = param_count
             
             # Update all grouped nodes to use the best display path
             # and capture concrete values that were absorbed by placeholders
-            for key, group_children in groups.items():
+            ordered_groups = []  # (earliest original position, children)
+            for key, first_child in groups.items():
+                group_children = merged.get(key)
+                if group_children is None:
+                    group_children = (first_child,)
+                    position = original_index[id(first_child)]
+                else:
+                    position = min(original_index[id(c)] for c in group_children)
+                ordered_groups.append((position, group_children))
+                
                 best_display = display_paths[key]
                 _, e_method, _, _ = key
                 
@@ -267,29 +319,31 @@ class HierarchyNormalizer:
                 all_params.update(absorbed)
                 combined = ', '.join(sorted(all_params)) if all_params else ''
                 
+                # HTTP groups share one display name, built once per group
+                if not e_method:
+                    display_name = None
+                elif combined:
+                    display_name = f"{e_method} {best_display} ({combined})"
+                else:
+                    display_name = f"{e_method} {best_display}"
+                
                 for child in group_children:
                     child['normalized_path'] = best_display
                     child['parameter_value'] = combined
-                    if e_method:
-                        display_name = f"{e_method} {best_display}"
-                        if combined:
-                            display_name += f" ({combined})"
+                    if display_name is not None:
                         child['span']['name'] = display_name
             
             # Restore original ordering: sort groups by earliest child's position
-            ordered_groups = sorted(
-                groups.values(),
-                key=lambda gc: min(original_index.get(id(c), float('inf')) for c in gc),
-            )
+            ordered_groups.sort(key=itemgetter(0))
             
             # Aggregate each group
             aggregated = []
-            for group_children in ordered_groups:
+            for _, group_children in ordered_groups:
                 if len(group_children) == 1:
                     # Single node - just recursively process children
                     node = group_children[0]
                     # Pass this node for filtering, count=1 for parallelism
-                    node['children'] = aggregate_siblings(node.get('children', []), node, parent_count=1, is_root_level=False)
+                    node['children'] = yield (node.get('children', []), node, 1, False)
                     node['aggregated'] = False
                     node['count'] = 1
                     # Ensure error information is preserved for single nodes
@@ -305,14 +359,14 @@ class HierarchyNormalizer:
                     self_time = sum(c.get('self_time_ms', 0) for c in group_children)
                     count = len(group_children)
                     
-                    # Collect all grandchildren
-                    all_grandchildren = []
-                    for c in group_children:
-                        all_grandchildren.extend(c.get('children', []))
+                    # Chain the grandchildren; the filter pass consumes them directly
+                    all_grandchildren = chain.from_iterable(
+                        c.get('children', ()) for c in group_children
+                    )
                     
                     # Recursively aggregate grandchildren
                     # Use first for filtering, count for parallelism detection
-                    aggregated_grandchildren = aggregate_siblings(all_grandchildren, first, parent_count=count, is_root_level=False)
+                    aggregated_grandchildren = yield (all_grandchildren, first, count, False)
                     
                     # Calculate parallelism for ALL aggregated nodes (count > 1)
                     # This shows effective wall-clock time vs cumulative time for any parallel execution
@@ -410,6 +464,27 @@ class HierarchyNormalizer:
             
             return aggregated
         
+        def run_aggregate_siblings(children, parent_node, parent_count, is_root_level):
+            """
+            Run aggregate_siblings, resolving its nested aggregations with an
+            explicit stack of generators instead of recursion.
+            
+            Returns:
+                List of aggregated child nodes
+            """
+            stack = [aggregate_siblings(children, parent_node, parent_count, is_root_level)]
+            result = None
+            while stack:
+                try:
+                    nested_args = stack[-1].send(result)
+                except StopIteration as finished:
+                    stack.pop()
+                    result = finished.value
+                else:
+                    stack.append(aggregate_siblings(*nested_args))
+                    result = None
+            return result
+        
         def detect_sibling_parallelism(all_final_children: List[Dict], parent_node: Optional[Dict]) -> None:
             """
             Detect parallelism across siblings (different services running concurrently).
@@ -499,46 +574,47 @@ class HierarchyNormalizer:
             - timeline_start_pct: Start position as % of parent's effective time (0-100)
             - timeline_end_pct: End position as % of parent's effective time (0-100)
             """
-            children = node.get('children', [])
-            if not children:
-                return
-            
-            # Get parent's time window
-            parent_start = node.get('start_time_ns', 0)
-            parent_end = node.get('end_time_ns', 0)
-            parent_duration = parent_end - parent_start if parent_end > parent_start else 0
-            
-            if parent_duration <= 0:
-                # Recurse anyway
-                for child in children:
-                    calculate_timeline_positions(child)
-                return
-            
-            # Calculate relative positions for each child
-            for child in children:
-                child_start = child.get('start_time_ns', parent_start)
-                child_end = child.get('end_time_ns', parent_end)
+            # Each node only reads its own window and writes its children's positions,
+            # so nodes can be visited in any order from an explicit stack
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                children = current.get('children', [])
+                if not children:
+                    continue
+                stack.extend(children)
                 
-                # Clamp to parent's window
-                child_start = max(child_start, parent_start)
-                child_end = min(child_end, parent_end)
+                # Get parent's time window
+                parent_start = current.get('start_time_ns', 0)
+                parent_end = current.get('end_time_ns', 0)
+                parent_duration = parent_end - parent_start if parent_end > parent_start else 0
                 
-                # Calculate percentages
-                start_pct = (child_start - parent_start) / parent_duration * 100
-                end_pct = (child_end - parent_start) / parent_duration * 100
+                if parent_duration <= 0:
+                    # Children are still visited through the stack
+                    continue
                 
-                child['timeline_start_pct'] = round(start_pct, 1)
-                child['timeline_end_pct'] = round(end_pct, 1)
-                child['timeline_width_pct'] = round(end_pct - start_pct, 1)
-                
-                # Recurse
-                calculate_timeline_positions(child)
+                # Calculate relative positions for each child
+                for child in children:
+                    child_start = child.get('start_time_ns', parent_start)
+                    child_end = child.get('end_time_ns', parent_end)
+                    
+                    # Clamp to parent's window
+                    child_start = max(child_start, parent_start)
+                    child_end = min(child_end, parent_end)
+                    
+                    # Calculate percentages
+                    start_pct = (child_start - parent_start) / parent_duration * 100
+                    end_pct = (child_end - parent_start) / parent_duration * 100
+                    
+                    child['timeline_start_pct'] = round(start_pct, 1)
+                    child['timeline_end_pct'] = round(end_pct, 1)
+                    child['timeline_width_pct'] = round(end_pct - start_pct, 1)
         
         # Normalize and process the root
         root_copy = root_node.copy()
         normalize_node(root_copy)
         # Process root's children with is_root_level=True and parent_count=1
-        root_copy['children'] = aggregate_siblings(root_copy.get('children', []), root_copy, parent_count=1, is_root_level=True)
+        root_copy['children'] = run_aggregate_siblings(root_copy.get('children', []), root_copy, parent_count=1, is_root_level=True)
         root_copy['aggregated'] = False
         root_copy['count'] = 1
         
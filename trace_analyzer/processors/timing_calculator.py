@@ -67,21 +67,36 @@ class TimingCalculator:
     
     def calculate_hierarchy_timings(self, node: Dict) -> None:
         """
-        Pass 3: Recursively traverse the hierarchy to aggregate children and calculate self-time.
+        Pass 3: Traverse the hierarchy to aggregate children and calculate self-time.
         Also calculates wall-clock time and parallelism factor for children.
         This works bottom-up.
         
+        Uses an explicit stack instead of recursion so deep call chains do not
+        hit the interpreter's recursion limit.
+        
         Args:
             node: Hierarchy node dictionary (modified in-place)
         """
-        if not node or not node.get('children'):
-            return
-        
-        # 1. Recurse to the bottom of the tree for all children
-        #    This ensures that everything below the current node is fully processed
-        for child in node['children']:
-            self.calculate_hierarchy_timings(child)
+        # 1. Post-order walk: every node is finalized only after everything below it
+        #    has been fully processed, children in their original order
+        stack = [(node, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if not current or not current.get('children'):
+                continue
+            if children_done:
+                self._calculate_node_timings(current)
+            else:
+                stack.append((current, True))
+                stack.extend((child, False) for child in reversed(current['children']))
+    
+    def _calculate_node_timings(self, node: Dict) -> None:
+        """
+        Aggregate a node's already-processed children and calculate its self-time.
         
+        Args:
+            node: Hierarchy node dictionary with children (modified in-place)
+        """
         # 2. Now that all children have been processed (including their own self-time
         #    and aggregation), aggregate the immediate children of the current node
         aggregated_children = self.aggregator.aggregate_list_of_nodes(node['children'])
@@ -126,7 +141,7 @@ class TimingCalculator:
     @staticmethod
     def recalculate_self_times(node: Dict) -> None:
         """
-        Recursively recalculate self-times after hierarchy modifications.
+        Recalculate self-times bottom-up after hierarchy modifications.
         Uses effective wall-clock time to handle parallel children correctly.
         
         Args:
@@ -135,10 +150,26 @@ class TimingCalculator:
         if not node:
             return
         
-        # Recurse to children first (bottom-up)
-        for child in node.get('children', []):
-            TimingCalculator.recalculate_self_times(child)
+        # Collect nodes parent-first, then visit them in reverse so every
+        # node is handled after all of its descendants (no recursion)
+        ordered = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ordered.append(current)
+            stack.extend(current.get('children', []))
+        
+        for current in reversed(ordered):
+            TimingCalculator._recalculate_node_self_time(current)
+    
+    @staticmethod
+    def _recalculate_node_self_time(node: Dict) -> None:
+        """
+        Recalculate the self-time of a single node from its children.
         
+        Args:
+            node: Hierarchy node dictionary (modified in-place)
+        """
         # Calculate self-time for this node
         children = node.get('children', [])
         if children:
@@ -136,10 +136,12 @@ class ShareStorage:
             results=results,
         )
         
-        # Write to file
+        # Write to file in a single call; share files are only read back by
+        # get_share, so they are stored compact (indentation disables the C encoder)
         share_path = self._get_share_path(share_id)
+        payload = json.dumps(share_data.to_dict(), separators=(',', ':'))
         with open(share_path, 'w', encoding='utf-8') as f:
-            json.dump(share_data.to_dict(), f, indent=2)
+            f.write(payload)
         
         return share_id, share_data
     
@@ -3,6 +3,25 @@ Result builder for web interface output.
 """
 
 from collections import defaultdict
+from operator import itemgetter
+
+_by_total_time = itemgetter('total_time_ms')
+_by_error_count = itemgetter('error_count')
+
+
+def _sorted_error_messages(error_messages):
+    """
+    Order error messages by occurrence count, most frequent first.
+    
+    Args:
+        error_messages: Mapping of error message -> count, or None if there were none
+        
+    Returns:
+        List of (message, count) tuples
+    """
+    if not error_messages:
+        return []
+    return sorted(error_messages.items(), key=itemgetter(1), reverse=True)
 
 
 def prepare_results(analyzer):
@@ -22,10 +41,12 @@ def prepare_results(analyzer):
     endpoint_effective = analyzer.effective_times.get('endpoints', {})
     service_effective = analyzer.effective_times.get('services', {})
     
+    total_requests = 0
     services_data = defaultdict(list)
     for (service, http_method, endpoint, param), stats in analyzer.endpoint_params.items():
         key = (service, http_method, endpoint, param)
         eff_time = endpoint_effective.get(key, stats['total_time_ms'])
+        total_requests += stats['count']
         cumulative = stats['total_time_ms']
         parallelism = cumulative / eff_time if eff_time > 0 else 1.0
         
@@ -43,17 +64,19 @@ def prepare_results(analyzer):
             'total_self_time_ms': stats.get('total_self_time_ms', 0.0),
             'total_self_time_formatted': analyzer.format_time(stats.get('total_self_time_ms', 0.0)),
             'error_count': stats['error_count'],
-            'error_messages': sorted(stats['error_messages'].items(), key=lambda item: -item[1])
+            'error_messages': _sorted_error_messages(stats['error_messages'])
         })
     
     for service in services_data:
-        services_data[service].sort(key=lambda x: -x['total_time_ms'])
+        services_data[service].sort(key=_by_total_time, reverse=True)
     
     services_summary = []
     for service, endpoints in services_data.items():
-        total_count = sum(e['count'] for e in endpoints)
-        total_time = sum(e['total_time_ms'] for e in endpoints)
-        total_self_time = sum(e['total_self_time_ms'] for e in endpoints)
+        total_count, total_time, total_self_time = 0, 0, 0
+        for e in endpoints:
+            total_count += e['count']
+            total_time += e['total_time_ms']
+            total_self_time += e['total_self_time_ms']
         
         # Get effective time for the service overall
         eff_time = service_effective.get(service, total_time)
@@ -73,7 +96,7 @@ def prepare_results(analyzer):
             'unique_combinations': len(endpoints)
         })
     
-    services_summary.sort(key=lambda x: -x['total_time_ms'])
+    services_summary.sort(key=_by_total_time, reverse=True)
     
     # Section 3: Service-to-Service Calls
     service_call_effective = analyzer.effective_times.get('service_calls', {})
@@ -99,19 +122,21 @@ def prepare_results(analyzer):
             'total_self_time_ms': stats.get('total_self_time_ms', 0.0),
             'total_self_time_formatted': analyzer.format_time(stats.get('total_self_time_ms', 0.0)),
             'error_count': stats['error_count'],
-            'error_messages': sorted(stats['error_messages'].items(), key=lambda item: -item[1])
+            'error_messages': _sorted_error_messages(stats['error_messages'])
         })
     
     service_calls_list = []
     for (caller, callee), calls in service_calls.items():
-        calls.sort(key=lambda x: -x['total_time_ms'])
-        total_count = sum(c['count'] for c in calls)
-        total_time = sum(c['total_time_ms'] for c in calls)
-        total_self_time = sum(c['total_self_time_ms'] for c in calls)
+        calls.sort(key=_by_total_time, reverse=True)
         
-        # Calculate effective time for the caller-callee pair
-        # Sum effective times of individual endpoints for this pair
-        eff_time = sum(c['effective_time_ms'] for c in calls)
+        # Effective time for the caller-callee pair is the sum of the
+        # effective times of its individual endpoints
+        total_count, total_time, total_self_time, eff_time = 0, 0, 0, 0
+        for c in calls:
+            total_count += c['count']
+            total_time += c['total_time_ms']
+            total_self_time += c['total_self_time_ms']
+            eff_time += c['effective_time_ms']
         parallelism = total_time / eff_time if eff_time > 0 else 1.0
         
         service_calls_list.append({
@@ -129,15 +154,18 @@ def prepare_results(analyzer):
             'calls': calls
         })
     
-    service_calls_list.sort(key=lambda x: -x['total_time_ms'])
+    service_calls_list.sort(key=_by_total_time, reverse=True)
     
     # Kafka Operations
     kafka_effective = analyzer.effective_times.get('kafka', {})
     
+    total_kafka_ops, total_kafka_time = 0, 0
     kafka_by_service = defaultdict(list)
     for (service, operation, message_type, details), stats in analyzer.kafka_messages.items():
         key = (service, operation, message_type, details)
         eff_time = kafka_effective.get(key, stats['total_time_ms'])
+        total_kafka_ops += stats['count']
+        total_kafka_time += stats['total_time_ms']
         cumulative = stats['total_time_ms']
         parallelism = cumulative / eff_time if eff_time > 0 else 1.0
         
@@ -153,17 +181,19 @@ def prepare_results(analyzer):
             'parallelism_factor': parallelism,
             'has_parallelism': parallelism > 1.15 and stats['count'] > 1,
             'error_count': stats['error_count'],
-            'error_messages': sorted(stats['error_messages'].items(), key=lambda item: -item[1])
+            'error_messages': _sorted_error_messages(stats['error_messages'])
         })
     
     kafka_services_list = []
     for service, operations in kafka_by_service.items():
-        operations.sort(key=lambda x: -x['total_time_ms'])
-        total_count = sum(op['count'] for op in operations)
-        total_time = sum(op['total_time_ms'] for op in operations)
+        operations.sort(key=_by_total_time, reverse=True)
         
-        # Calculate effective time for all kafka ops for this service
-        eff_time = sum(op['effective_time_ms'] for op in operations)
+        # Effective time for all kafka ops for this service
+        total_count, total_time, eff_time = 0, 0, 0
+        for op in operations:
+            total_count += op['count']
+            total_time += op['total_time_ms']
+            eff_time += op['effective_time_ms']
         parallelism = total_time / eff_time if eff_time > 0 else 1.0
         
         kafka_services_list.append({
@@ -178,14 +208,11 @@ def prepare_results(analyzer):
             'operations': operations
         })
     
-    kafka_services_list.sort(key=lambda x: -x['total_time_ms'])
+    kafka_services_list.sort(key=_by_total_time, reverse=True)
     
-    # Summary statistics
-    total_requests = sum(stats['count'] for stats in analyzer.endpoint_params.values())
+    # Summary statistics (request and Kafka totals are accumulated above)
     total_wall_clock_time_ms = sum(summary['wall_clock_duration_ms'] 
                                    for summary in analyzer.trace_summary.values())
-    total_kafka_ops = sum(stats['count'] for stats in analyzer.kafka_messages.values())
-    total_kafka_time = sum(stats['total_time_ms'] for stats in analyzer.kafka_messages.values())
     
     # Error Analysis
     errors_by_service = defaultdict(list)
@@ -231,7 +258,7 @@ def prepare_results(analyzer):
     
     # Sort errors within each service by count
     for service in errors_by_service:
-        errors_by_service[service].sort(key=lambda x: -x['error_count'])
+        errors_by_service[service].sort(key=_by_error_count, reverse=True)
     
     total_errors = sum(e['error_count'] for service_errors in errors_by_service.values() 
                       for e in service_errors)